@@ -1,9 +1,53 @@
-from fastapi import APIRouter, Depends
-from app.schemas.job import JobRequest
-from app.services.career_service import generate_career_plan_logic
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from app.core.config import settings
+from app.schemas.job import BatchJobRequest, BatchJobResponse, JobRequest
+from app.schemas.plan import CareerPlan
+from app.services.batch_service import generate_career_plans_batch_logic
+from app.services.career_service import generate_career_plan_logic, stream_career_plan_logic
+from app.services.deadline import effective_timeout
 
 router = APIRouter()
 
-@router.post("/career-plan")
-async def generate_career_plan(request: JobRequest):
-    return generate_career_plan_logic(request.category, request.job_description, request.timeline)
+@router.post("/career-plan", response_model=CareerPlan, responses={504: {"description": "Request deadline exceeded"}})
+async def generate_career_plan(request: JobRequest, http_request: Request,
+                               x_request_timeout: Optional[float] = Header(default=None, gt=0),
+                               accept_encoding: Optional[str] = Header(default=None)):
+    """Generate a plan; generation is aborted if the client disconnects or the deadline passes.
+
+    The deadline is REQUEST_TIMEOUT_SECONDS, or the ``X-Request-Timeout`` header (seconds) if shorter.
+    """
+    return await generate_career_plan_logic(
+        request.category, request.job_description, request.timeline, request.user_id,
+        timeout=effective_timeout(settings.REQUEST_TIMEOUT_SECONDS, x_request_timeout),
+        is_disconnected=http_request.is_disconnected,
+        accept_encoding=accept_encoding,
+    )
+
+
+@router.post("/career-plan/stream")
+async def stream_career_plan(request: JobRequest):
+    """Stream the plan as NDJSON events: each topic and skill as it completes, then the full plan."""
+    return await stream_career_plan_logic(request.category, request.job_description, request.timeline, request.user_id)
+
+
+@router.post("/career-plans/batch", response_model=BatchJobResponse,
+             responses={200: {"content": {"application/x-ndjson": {}}}})
+async def generate_career_plans(batch: BatchJobRequest, http_request: Request,
+                                x_request_timeout: Optional[float] = Header(default=None, gt=0),
+                                accept: Optional[str] = Header(default=None)):
+    """Generate plans for many users at once; each item reports its own status.
+
+    With ``Accept: application/x-ndjson`` each item's result is streamed as one line as soon as it
+    is ready, in completion order. Items still running at the deadline (BATCH_TIMEOUT_SECONDS, or
+    the ``X-Request-Timeout`` header if shorter) are reported with status code 504; generation is
+    aborted if the client disconnects.
+    """
+    if len(batch.requests) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {settings.BATCH_MAX_ITEMS} items")
+    return await generate_career_plans_batch_logic(
+        batch.requests,
+        timeout=effective_timeout(settings.BATCH_TIMEOUT_SECONDS, x_request_timeout),
+        is_disconnected=http_request.is_disconnected,
+        stream="application/x-ndjson" in (accept or ""),
+    )
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, status
+from app.core.responses import ORJSONResponse
+from app.services.ollama_pool import get_backend_pool
+from app.services.warmup import model_warmup
+
+router = APIRouter()
+
+@router.get("/health")
+async def health():
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+@router.get("/ready")
+async def ready():
+    """Readiness: the startup warm-up has loaded the model; ``backends`` shows where it is loaded now."""
+    backends = {backend.name: backend.warm for backend in get_backend_pool().backends}
+    if not model_warmup.ready:
+        return ORJSONResponse(content={"status": "warming_up", "backends": backends},
+                              status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return {"status": "ready", "backends": backends}
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, HTTPException, status
+from app.core.responses import ORJSONResponse
+from app.schemas.job import JobRequest, PlanJobStatus
+from app.schemas.plan import CareerPlan
+from app.services.plan_jobs import FAILED, SUCCEEDED, plan_jobs
+
+router = APIRouter(prefix="/career-plan/jobs")
+
+def _job_status(job: dict) -> PlanJobStatus:
+    return PlanJobStatus(
+        job_id=job["id"], user_id=job["user_id"], status=job["status"],
+        created_at=job["created_at"], updated_at=job["updated_at"],
+        status_code=job["status_code"], detail=job["detail"],
+    )
+
+async def _get_job(job_id: str) -> dict:
+    job = await plan_jobs.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("", response_model=PlanJobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def submit_career_plan_job(request: JobRequest):
+    """Queue a career plan generation and return its job id immediately."""
+    return _job_status(await plan_jobs.submit(request))
+
+@router.get("/{job_id}", response_model=PlanJobStatus)
+async def get_career_plan_job(job_id: str):
+    return _job_status(await _get_job(job_id))
+
+@router.get("/{job_id}/result", response_model=CareerPlan, responses={202: {"model": PlanJobStatus}})
+async def get_career_plan_job_result(job_id: str):
+    """Return the plan once the job succeeded; 202 with the job status while it is still pending."""
+    job = await _get_job(job_id)
+    if job["status"] == SUCCEEDED:
+        return ORJSONResponse(content=job["result"], status_code=status.HTTP_200_OK)
+    if job["status"] == FAILED:
+        raise HTTPException(status_code=job["status_code"] or 500, detail=job["detail"])
+    return ORJSONResponse(content=_job_status(job).model_dump(), status_code=status.HTTP_202_ACCEPTED)
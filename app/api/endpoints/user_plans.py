@@ -0,0 +1,55 @@
+from typing import Optional
+
+import orjson
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+from app.core.config import settings
+from app.core.responses import ORJSONResponse
+from app.schemas.user_plan import UserPlan, UserPlanPage
+from app.services.user_plans import user_plans
+
+router = APIRouter(prefix="/users/{user_id}/plans")
+
+# Clients may keep a copy but must revalidate it (cheaply, via If-None-Match) before reuse
+_CACHE_CONTROL = "private, no-cache"
+
+def _summary(record: dict) -> dict:
+    return {
+        "plan_id": record["id"], "category": record["category"], "timeline": record["timeline"],
+        "created_at": record["created_at"], "updated_at": record["updated_at"],
+    }
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+@router.get("", response_model=UserPlanPage)
+async def list_user_plans(user_id: str, cursor: Optional[str] = None,
+                          limit: int = Query(default=settings.USER_PLANS_PAGE_SIZE, ge=1, le=settings.USER_PLANS_MAX_PAGE_SIZE)):
+    """List the user's plans, newest first; pass ``next_cursor`` back as ``cursor`` for the next page."""
+    try:
+        position = int(cursor) if cursor is not None else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    records, next_cursor = await user_plans.list(user_id, limit, position)
+    return ORJSONResponse(content={
+        "plans": [_summary(record) for record in records],
+        "next_cursor": str(next_cursor) if next_cursor is not None else None,
+    })
+
+@router.get("/{plan_id}", response_model=UserPlan, responses={304: {"description": "Not modified"}})
+async def get_user_plan(user_id: str, plan_id: str, if_none_match: Optional[str] = Header(default=None)):
+    """Return one stored plan; answers 304 without a body when ``If-None-Match`` carries its ETag."""
+    record = await user_plans.get(user_id, plan_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    headers = {"ETag": record["etag"], "Cache-Control": _CACHE_CONTROL}
+    if _etag_matches(if_none_match, record["etag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    content = _summary(record)
+    content.update(user_id=record["user_id"], job_description=record["job_description"], plan=orjson.loads(record["plan_json"]))
+    return ORJSONResponse(content=content, headers=headers)
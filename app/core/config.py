@@ -1,11 +1,102 @@
 import os
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Kairos - AI Interview Prep Planner"
     OLLAMA_MODEL: str = "gpt-oss:120b-cloud"
     PROMPT_TEMPLATE_PATH: str = "resources/prompt.txt"
-    LOG_LEVEL: str = "TRACE"
+    LOG_LEVEL: str = "INFO"
+    # "json" for structured logs, "text" for human-readable lines
+    LOG_FORMAT: str = "json"
+    # Share of large payloads (prompts, raw completions) that are logged, and their size cap
+    LOG_PAYLOAD_SAMPLE_RATE: float = 0.1
+    LOG_PAYLOAD_MAX_CHARS: int = 2048
+
+    # Optional per-category prompt templates, e.g. {"Android": "resources/prompt_android.txt"}
+    PROMPT_TEMPLATES: Dict[str, str] = {}
+    # Minimum seconds between mtime checks of a loaded prompt template
+    PROMPT_TEMPLATE_CHECK_INTERVAL: float = 1.0
+
+    # "single" asks for the whole plan in one completion; "parallel" extracts the skills first and
+    # then generates each skill's topics concurrently (each skill's topics are cached on their own)
+    GENERATION_MODE: str = "single"
+    SKILLS_PROMPT_TEMPLATE_PATH: str = "resources/prompt_skills.txt"
+    TOPICS_PROMPT_TEMPLATE_PATH: str = "resources/prompt_topics.txt"
+
+    # Job description preprocessing: strip markup and boilerplate, then cap the estimated tokens (0 = no cap)
+    JD_PREPROCESS_ENABLED: bool = True
+    JD_MAX_TOKENS: int = 1500
+
+    # Plan responses are serialized once and their gzip/brotli variants kept with the cached plan
+    RESPONSE_COMPRESSION_ENABLED: bool = True
+    RESPONSE_COMPRESS_MIN_BYTES: int = 1024
+    RESPONSE_GZIP_LEVEL: int = 9
+    RESPONSE_BROTLI_QUALITY: int = 9
+
+    # Deadline for /career-plan in seconds (0 = none); clients may ask for less via X-Request-Timeout.
+    # The in-flight generation is aborted when it passes or the client disconnects.
+    REQUEST_TIMEOUT_SECONDS: float = 300.0
+    DISCONNECT_POLL_INTERVAL: float = 0.5
+
+    # Maximum number of Ollama generations in flight per worker process
+    OLLAMA_MAX_CONCURRENCY: int = 8
+
+    # Ollama backend pool; an empty list uses the default host (OLLAMA_HOST env var or localhost)
+    OLLAMA_HOSTS: List[str] = []
+    OLLAMA_MAX_CONNECTIONS_PER_HOST: int = 16
+    OLLAMA_HEALTH_CHECK_INTERVAL: float = 10.0
+    OLLAMA_HEALTH_CHECK_TIMEOUT: float = 2.0
+    OLLAMA_EJECT_AFTER_FAILURES: int = 3
+    OLLAMA_EJECT_SECONDS: float = 30.0
+
+    # Model residency: how long Ollama keeps the model loaded after a request, as a duration with a unit
+    # ("30m", "24h"; a negative one such as "-1m" = forever) and the context window (0 keeps the server default)
+    OLLAMA_KEEP_ALIVE: str = "30m"
+    OLLAMA_NUM_CTX: int = 0
+    # Pre-load the model at startup; /ready reports 503 until it is first loaded
+    WARMUP_ENABLED: bool = True
+    WARMUP_TIMEOUT_SECONDS: float = 600.0
+    # Load the model again when a health check finds it unloaded (e.g. after OLLAMA_KEEP_ALIVE idle time);
+    # false lets Ollama unload an idle model and the next request pays for the reload
+    WARMUP_KEEP_LOADED: bool = True
+    # Backoff between failed warm-up rounds (e.g. Ollama not up yet), doubling up to the maximum
+    WARMUP_RETRY_INITIAL_SECONDS: float = 1.0
+    WARMUP_RETRY_MAX_SECONDS: float = 60.0
+
+    # Admission control: bounded wait queue and per-user budget in front of the model
+    SCHEDULER_MAX_QUEUE: int = 64
+    SCHEDULER_PER_USER_LIMIT: int = 4
+    SCHEDULER_RETRY_AFTER_SECONDS: int = 5
+
+    # Batch endpoint limits
+    BATCH_MAX_ITEMS: int = 500
+    BATCH_MAX_PARALLELISM: int = 4
+    # Deadline for a whole batch in seconds (0 = none); items still running are reported with 504
+    BATCH_TIMEOUT_SECONDS: float = 600.0
+
+    # Asynchronous job mode (submit, poll, fetch)
+    JOBS_DB_PATH: str = "kairos_jobs.db"
+    JOBS_WORKERS: int = 4
+    JOBS_MAX_PENDING: int = 1000
+
+    # Per-user plan history served by /users/{user_id}/plans; repeat requests are answered from it
+    USER_PLANS_ENABLED: bool = True
+    USER_PLANS_DB_PATH: str = "kairos_plans.db"
+    USER_PLANS_PAGE_SIZE: int = 20
+    USER_PLANS_MAX_PAGE_SIZE: int = 100
+
+    # Plan result cache (in-memory LRU with TTL, optionally persisted to SQLite)
+    PLAN_CACHE_ENABLED: bool = True
+    PLAN_CACHE_MAX_ENTRIES: int = 1024
+    PLAN_CACHE_TTL_SECONDS: int = 86400
+    PLAN_CACHE_DB_PATH: str = ""
+
+    # Semantic near-duplicate cache over job description embeddings
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_EMBED_MODEL: str = "nomic-embed-text"
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95
+    SEMANTIC_CACHE_CAPACITY: int = 2048
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,88 @@
+import asyncio
+import gzip
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+from fastapi.responses import Response
+
+from app.core import metrics
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip alone is served without it
+    brotli = None
+
+def available_encodings() -> Tuple[str, ...]:
+    """Supported content codings, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=settings.RESPONSE_BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=settings.RESPONSE_GZIP_LEVEL, mtime=0)
+
+class EncodedBody:
+    """A JSON body serialized once, with each compressed variant created on first request and then reused."""
+
+    __slots__ = ("identity", "_variants")
+
+    def __init__(self, identity: bytes):
+        self.identity = identity
+        self._variants: Dict[str, bytes] = {}
+
+    @classmethod
+    def from_content(cls, content: Any) -> "EncodedBody":
+        return cls(orjson.dumps(content))
+
+    async def variant(self, encoding: Optional[str]) -> bytes:
+        if encoding is None:
+            return self.identity
+        data = self._variants.get(encoding)
+        if data is None:
+            # Compression at high levels takes milliseconds on large plans; keep it off the event loop
+            with metrics.timed("compress"):
+                data = await asyncio.to_thread(_compress, self.identity, encoding)
+            self._variants[encoding] = data
+        return data
+
+def negotiate_encoding(accept_encoding: Optional[str], available: Tuple[str, ...]) -> Optional[str]:
+    """Pick the best coding from ``available`` allowed by an Accept-Encoding header; None means identity.
+
+    Ties in q-value go to the server's order of preference in ``available``.
+    """
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[name] = quality
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+async def encoded_json_response(body: EncodedBody, accept_encoding: Optional[str], status_code: int = 200) -> Response:
+    """Serve pre-serialized JSON in the best encoding the client accepts."""
+    encoding = None
+    if settings.RESPONSE_COMPRESSION_ENABLED and len(body.identity) >= settings.RESPONSE_COMPRESS_MIN_BYTES:
+        encoding = negotiate_encoding(accept_encoding, available_encodings())
+    content = await body.variant(encoding)
+    metrics.RESPONSE_BYTES.labels(encoding or "identity").inc(len(content))
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=content, status_code=status_code, media_type="application/json", headers=headers)
@@ -1,17 +1,138 @@
+import atexit
 import logging
+import logging.handlers
+import queue
+import random
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+import orjson
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
 
-def setup_logging():
+# Request id of the request being served, attached to every log record emitted while serving it
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+_STANDARD_ATTRS = set(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {"message", "asctime", "request_id"}
+_listener: Optional[logging.handlers.QueueListener] = None
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request id; runs in the caller's context, before the queue."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+class _DeferredFormatQueueHandler(logging.handlers.QueueHandler):
+    """Queue records without formatting them; tracebacks and JSON are rendered on the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode("utf-8")
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines; extra fields (e.g. a logged payload) follow the message as key=value."""
+
+    def __init__(self):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s')
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        line = super().formatMessage(record)
+        extras = " ".join(f"{key}={value}" for key, value in record.__dict__.items() if key not in _STANDARD_ATTRS)
+        return f"{line} {extras}" if extras else line
+
+def _level() -> int:
     log_level = settings.LOG_LEVEL.upper()
     # Map TRACE to DEBUG as python logging doesn't have TRACE by default
     if log_level == "TRACE":
-        level = logging.DEBUG
+        return logging.DEBUG
+    return getattr(logging, log_level, logging.INFO)
+
+def setup_logging():
+    """Route all logging through a queue drained by a background thread, so callers never block on I/O."""
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler()
+    if settings.LOG_FORMAT.lower() == "json":
+        output.setFormatter(JsonFormatter())
     else:
-        level = getattr(logging, log_level, logging.INFO)
+        output.setFormatter(TextFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _DeferredFormatQueueHandler(log_queue)
+    handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(_level())
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=False)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def log_payload(logger: logging.Logger, level: int, label: str, payload: str) -> None:
+    """Log a large payload (prompt, raw completion) subject to sampling and a size cap."""
+    if not logger.isEnabledFor(level) or random.random() >= settings.LOG_PAYLOAD_SAMPLE_RATE:
+        return
+    limit = settings.LOG_PAYLOAD_MAX_CHARS
+    size = len(payload)
+    if size > limit:
+        payload = f"{payload[:limit]}...[truncated {size - limit} chars]"
+    logger.log(level, label, extra={"payload": payload, "payload_chars": size})
+
+class RequestIdMiddleware:
+    """Propagate X-Request-ID (or generate one) into the logging context and the response.
+
+    Plain ASGI middleware, so client disconnects stay visible to the route (see ``MetricsMiddleware``).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get("x-request-id") or uuid.uuid4().hex
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
 
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    # You can add more advanced logging setup here (e.g., file handlers, JSON formatting)
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
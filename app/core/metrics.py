@@ -0,0 +1,125 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Mapping, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from prometheus_client import Counter, Gauge, Histogram
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+REQUEST_LATENCY = Histogram(
+    "kairos_request_duration_seconds", "HTTP request latency", ["method", "route", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge("kairos_requests_in_flight", "HTTP requests currently being served")
+STAGE_LATENCY = Histogram(
+    "kairos_stage_duration_seconds", "Time spent in each career plan stage", ["stage"],
+    buckets=_LATENCY_BUCKETS,
+)
+MODEL_IN_FLIGHT = Gauge("kairos_model_requests_in_flight", "Model generations currently running")
+MODEL_QUEUED = Gauge("kairos_model_requests_queued", "Requests waiting for a model slot")
+PARSE_FAILURES = Counter("kairos_parse_failures_total", "Model responses that could not be parsed as JSON")
+SCHEMA_FAILURES = Counter("kairos_schema_failures_total", "Parsed model responses that did not match the plan schema")
+CACHE_LOOKUPS = Counter("kairos_plan_cache_lookups_total", "Plan cache lookups", ["result"])
+OLLAMA_DURATION = Histogram(
+    "kairos_ollama_duration_seconds", "Durations reported by Ollama in chat responses", ["phase"],
+    buckets=_LATENCY_BUCKETS,
+)
+RESPONSE_BYTES = Counter("kairos_plan_response_bytes_total", "Plan response body bytes sent", ["encoding"])
+CANCELLED_REQUESTS = Counter(
+    "kairos_cancelled_requests_total", "Requests abandoned before completion, freeing their model slot", ["reason"]
+)
+CANCELLED_REQUEST_SECONDS = Histogram(
+    "kairos_cancelled_request_seconds", "Time spent on requests before they were abandoned", ["reason"],
+    buckets=_LATENCY_BUCKETS,
+)
+JOB_DESCRIPTION_TOKENS = Histogram(
+    "kairos_job_description_tokens", "Estimated job description tokens before and after preprocessing", ["stage"],
+    buckets=(50, 100, 250, 500, 1000, 1500, 2500, 5000, 10000),
+)
+OLLAMA_TOKENS = Counter("kairos_ollama_tokens_total", "Tokens processed by Ollama", ["kind"])
+
+# Ollama response field -> (metric phase label, Server-Timing name)
+_OLLAMA_DURATIONS = {
+    "total_duration": ("total", "ollama_total"),
+    "load_duration": ("load", "model_load"),
+    "prompt_eval_duration": ("prompt_eval", "prompt_eval"),
+    "eval_duration": ("eval", "generation"),
+}
+_OLLAMA_COUNTS = {"prompt_eval_count": "prompt", "eval_count": "generated"}
+
+# Per-request stage timings (seconds), collected for the Server-Timing header
+_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("timings", default=None)
+
+def record_stage(stage: str, seconds: float) -> None:
+    STAGE_LATENCY.labels(stage).observe(seconds)
+    timings = _timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+@contextmanager
+def timed(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start)
+
+def record_ollama_response(response: Mapping[str, Any]) -> None:
+    """Export the timing and token counters Ollama reports with a completed chat response."""
+    timings = _timings.get()
+    for field, (phase, timing_name) in _OLLAMA_DURATIONS.items():
+        nanoseconds = response.get(field)
+        if nanoseconds:
+            seconds = nanoseconds / 1e9
+            OLLAMA_DURATION.labels(phase).observe(seconds)
+            if timings is not None:
+                timings[timing_name] = timings.get(timing_name, 0.0) + seconds
+    for field, kind in _OLLAMA_COUNTS.items():
+        count = response.get(field)
+        if count:
+            OLLAMA_TOKENS.labels(kind).inc(count)
+
+def format_server_timing(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items())
+
+class MetricsMiddleware:
+    """Record request latency and attach a Server-Timing breakdown to the response.
+
+    Plain ASGI middleware rather than ``BaseHTTPMiddleware``, so the client's ``http.disconnect``
+    still reaches ``Request.is_disconnected()`` in the route.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: Dict[str, float] = {}
+        token = _timings.set(timings)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                timings["total"] = time.perf_counter() - start
+                headers = MutableHeaders(scope=message)
+                headers["Server-Timing"] = format_server_timing(timings)
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            REQUEST_LATENCY.labels(scope["method"], route_path, str(status_code)).observe(time.perf_counter() - start)
+            _timings.reset(token)
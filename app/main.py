@@ -1,15 +1,42 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from app.core.config import settings
-from app.core.logging import setup_logging
-from app.api.endpoints import career
+from app.core.logging import RequestIdMiddleware, setup_logging
+from app.core.metrics import MetricsMiddleware
+from app.api.endpoints import career, health, jobs, metrics, user_plans as user_plan_routes
+from app.services.ollama_pool import get_backend_pool
+from app.services.plan_jobs import plan_jobs
+from app.services.user_plans import user_plans
+from app.services.warmup import model_warmup
 
 # Setup logging
 setup_logging()
 
-app = FastAPI(title=settings.PROJECT_NAME)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    pool = get_backend_pool()
+    pool.start_health_checks(settings.OLLAMA_HEALTH_CHECK_INTERVAL, settings.OLLAMA_HEALTH_CHECK_TIMEOUT)
+    model_warmup.start(pool)
+    await plan_jobs.start()
+    yield
+    await plan_jobs.stop()
+    await model_warmup.stop()
+    user_plans.close()
+    await pool.close()
+
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
+
+# Added last runs outermost: the request id is set before metrics and route handling
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestIdMiddleware)
 
 # Include routers
 app.include_router(career.router)
+app.include_router(health.router)
+app.include_router(jobs.router)
+app.include_router(metrics.router)
+app.include_router(user_plan_routes.router)
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,7 +1,33 @@
+from typing import Any, List, Optional
 from pydantic import BaseModel
+from app.schemas.plan import CareerPlan
 
 class JobRequest(BaseModel):
     user_id: str
     category: str
     timeline: str
-    job_description: str
\ No newline at end of file
+    job_description: str
+
+class BatchJobRequest(BaseModel):
+    # Items are validated one by one as JobRequest, so a malformed item fails alone with a 422
+    requests: List[Any]
+
+class BatchItemResult(BaseModel):
+    index: int
+    status: str
+    status_code: int
+    plan: Optional[CareerPlan] = None
+    detail: Optional[str] = None
+
+class BatchJobResponse(BaseModel):
+    results: List[BatchItemResult]
+
+
+class PlanJobStatus(BaseModel):
+    job_id: str
+    user_id: str
+    status: str
+    created_at: float
+    updated_at: float
+    status_code: Optional[int] = None
+    detail: Optional[str] = None
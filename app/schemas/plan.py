@@ -0,0 +1,29 @@
+from typing import List, Literal
+from pydantic import BaseModel
+
+class Topic(BaseModel):
+    topic_name: str
+    study_material: str
+    timeline: str
+    priority: Literal["High", "Medium", "Low"]
+    bonus: bool
+
+class Skill(BaseModel):
+    skill_name: str
+    total_days: int
+    topics: List[Topic]
+
+class CareerPlan(BaseModel):
+    skills: List[Skill]
+
+class SkillOutline(BaseModel):
+    skill_name: str
+    total_days: int
+
+class SkillOutlinePlan(BaseModel):
+    """First phase of two-phase generation: the skills and their share of the timeline."""
+    skills: List[SkillOutline]
+
+class SkillTopics(BaseModel):
+    """Second phase of two-phase generation: the topic breakdown of one skill."""
+    topics: List[Topic]
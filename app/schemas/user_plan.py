@@ -0,0 +1,19 @@
+from typing import List, Optional
+from pydantic import BaseModel
+from app.schemas.plan import CareerPlan
+
+class UserPlanSummary(BaseModel):
+    plan_id: str
+    category: str
+    timeline: str
+    created_at: float
+    updated_at: float
+
+class UserPlanPage(BaseModel):
+    plans: List[UserPlanSummary]
+    next_cursor: Optional[str] = None
+
+class UserPlan(UserPlanSummary):
+    user_id: str
+    job_description: str
+    plan: CareerPlan
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import Response, StreamingResponse
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.schemas.job import BatchItemResult, BatchJobResponse, JobRequest
+from app.services.career_service import CLIENT_CLOSED_REQUEST, get_prepared_career_plan, prepare_plan_inputs, store_user_plan
+from app.services.deadline import DEADLINE, DISCONNECT, RequestCancelled, record_cancellation
+
+logger = logging.getLogger(__name__)
+
+def validation_detail(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in e['loc']) or 'item'}: {e['msg']}" for e in error.errors())
+
+async def iter_career_plans_batch(items: List[Any], timeout: Optional[float] = None,
+                                  is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None) -> AsyncIterator[BatchItemResult]:
+    """Generate plans for many requests, yielding each item's result as soon as it is ready.
+
+    Items are validated individually and each distinct input is generated once, with bounded
+    parallelism. Failures, including malformed items (422), are reported per item; one bad item
+    never fails the batch. Items still running when ``timeout`` passes are aborted and reported
+    with 504. If the client disconnects, all in-flight generations are aborted and
+    ``RequestCancelled`` is raised.
+    """
+    start = time.monotonic()
+    requests: Dict[int, JobRequest] = {}
+    # Cache key -> (prepared job description, indices of the requests sharing it)
+    groups: Dict[str, Tuple[str, List[int]]] = {}
+    for index, item in enumerate(items):
+        try:
+            request = requests[index] = JobRequest.model_validate(item)
+        except ValidationError as e:
+            yield BatchItemResult(index=index, status="error", status_code=422, detail=validation_detail(e))
+            continue
+        try:
+            job_description, key = prepare_plan_inputs(request.category, request.job_description, request.timeline)
+        except HTTPException as e:
+            yield BatchItemResult(index=index, status="error", status_code=e.status_code, detail=str(e.detail))
+            continue
+        groups.setdefault(key, (job_description, []))[1].append(index)
+
+    logger.info(f"Batch of {len(items)} career plan requests has {len(groups)} distinct inputs")
+    limit = asyncio.Semaphore(max(1, settings.BATCH_MAX_PARALLELISM))
+
+    async def run(key: str, job_description: str, indices: List[int]) -> List[BatchItemResult]:
+        request = requests[indices[0]]
+        # Every user in the group gets the plan in their history, not only the one it was generated for
+        user_ids = list(dict.fromkeys(requests[index].user_id for index in indices))
+        async with limit:
+            try:
+                plan = await get_prepared_career_plan(request.category, job_description, request.timeline, key, user_ids[0])
+                for user_id in user_ids[1:]:
+                    await store_user_plan(user_id, key, request.category, job_description, request.timeline, plan)
+                outcome = {"status": "ok", "status_code": 200, "plan": plan}
+            except HTTPException as e:
+                outcome = {"status": "error", "status_code": e.status_code, "detail": str(e.detail)}
+            except Exception as e:
+                logger.error(f"Batch item failed: {str(e)}")
+                outcome = {"status": "error", "status_code": 500, "detail": str(e)}
+        return [BatchItemResult(index=index, **outcome) for index in indices]
+
+    tasks = {
+        asyncio.ensure_future(run(key, job_description, indices)): indices
+        for key, (job_description, indices) in groups.items()
+    }
+    try:
+        while tasks:
+            wait = settings.DISCONNECT_POLL_INTERVAL if is_disconnected is not None else None
+            if timeout is not None:
+                remaining = max(timeout - (time.monotonic() - start), 0)
+                wait = remaining if wait is None else min(wait, remaining)
+            done, _ = await asyncio.wait(tasks, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                del tasks[task]
+                for result in task.result():
+                    yield result
+            if not tasks:
+                break
+            if timeout is not None and time.monotonic() - start >= timeout:
+                timed_out = sorted(index for indices in tasks.values() for index in indices)
+                await _cancel(tasks)
+                record_cancellation(DEADLINE, time.monotonic() - start)
+                for index in timed_out:
+                    yield BatchItemResult(index=index, status="error", status_code=504, detail="Request deadline exceeded")
+                break
+            if is_disconnected is not None and await is_disconnected():
+                await _cancel(tasks)
+                raise record_cancellation(DISCONNECT, time.monotonic() - start)
+    finally:
+        # Also reached when the consumer stops early, e.g. a streaming response cancelled on disconnect
+        await _cancel(tasks)
+
+async def _cancel(tasks: Dict[asyncio.Future, List[int]]) -> None:
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    tasks.clear()
+
+async def generate_career_plans_batch(items: List[Any], timeout: Optional[float] = None,
+                                      is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None) -> List[BatchItemResult]:
+    """All of a batch's results, in request order."""
+    results = [result async for result in iter_career_plans_batch(items, timeout, is_disconnected)]
+    return sorted(results, key=lambda result: result.index)
+
+async def generate_career_plans_batch_logic(items: List[Any], timeout: Optional[float] = None,
+                                            is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+                                            stream: bool = False) -> Response:
+    if stream:
+        return StreamingResponse(_ndjson_results(iter_career_plans_batch(items, timeout, is_disconnected)),
+                                 media_type="application/x-ndjson")
+    try:
+        results = await generate_career_plans_batch(items, timeout, is_disconnected)
+    except RequestCancelled:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    return Response(content=BatchJobResponse(results=results).model_dump_json(), media_type="application/json")
+
+async def _ndjson_results(results: AsyncIterator[BatchItemResult]):
+    try:
+        async for result in results:
+            yield orjson.dumps(result.model_dump(mode="json")) + b"\n"
+    except RequestCancelled:
+        # The client is gone; end the body quietly
+        return
@@ -1,57 +1,355 @@
 import json
 import logging
-import ollama
+import sqlite3
+import time
+from typing import Awaitable, Callable, Optional, Tuple
+import orjson
+from pydantic import ValidationError
 from fastapi import HTTPException,status
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response, StreamingResponse
+from app.core import metrics
 from app.core.config import settings
+from app.core.encoding import EncodedBody, encoded_json_response
+from app.core.logging import log_payload
+from app.schemas.plan import CareerPlan
+from app.services.deadline import DEADLINE, RequestCancelled, run_cancellable
+from app.services.jd_preprocess import estimate_tokens, preprocess_job_description
+from app.services.json_extract import parse_model_json
+from app.services.ollama_pool import get_backend_pool, model_request_options
+from app.services.parallel_plan import generate_plan_two_phase
+from app.services.plan_cache import make_cache_key, plan_cache
+from app.services.plan_stream import IncrementalPlanParser
+from app.services.prompt_template import PromptTemplate, prompt_templates, template_path_for
+from app.services.scheduler import AdmissionRejected, plan_scheduler
+from app.services.semantic_cache import semantic_cache, semantic_cache_scope, semantic_cache_text
+from app.services.single_flight import SingleFlight
+from app.services.user_plans import user_plans
 import re
-import traceback
 
 logger = logging.getLogger(__name__)
 
-def get_prompt(category: str, job_description: str, timeline: str) -> str:
+# JSON Schema passed to Ollama's `format` parameter so decoding is constrained to a valid plan
+CAREER_PLAN_SCHEMA = CareerPlan.model_json_schema()
+
+# Non-standard status (nginx convention) recorded when the client went away before the response
+CLIENT_CLOSED_REQUEST = 499
+
+# Identical requests (same cache key, regardless of user_id) share one generation
+plan_requests = SingleFlight()
+
+def _admission_error(e: AdmissionRejected) -> HTTPException:
+    logger.warning(f"Rejected career plan request: {e.detail}")
+    return HTTPException(status_code=e.status_code, detail=e.detail, headers={"Retry-After": str(e.retry_after)})
+
+def load_prompt_template(category: Optional[str] = None) -> PromptTemplate:
+    return load_template_file(template_path_for(category, settings.PROMPT_TEMPLATE_PATH, settings.PROMPT_TEMPLATES))
+
+def load_template_file(path: str) -> PromptTemplate:
     try:
-        with open(settings.PROMPT_TEMPLATE_PATH, 'r') as f:
-            template = f.read()
-        return template.replace('{category}', category).replace('{job_description}', job_description).replace('{timeline}', timeline)
+        return prompt_templates.get(path)
     except FileNotFoundError:
-        logger.error(f"Prompt template file '{settings.PROMPT_TEMPLATE_PATH}' not found")
+        logger.error(f"Prompt template file '{path}' not found")
         raise HTTPException(status_code=500, detail="Prompt template not found")
     except Exception as e:
         logger.error(f"Error reading prompt template: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-def generate_career_plan_logic(category: str, job_description: str, timeline: str):
-    prompt = get_prompt(category, job_description, timeline)
-    logger.info("Prompt generated successfully")
-    
-    try:
-        logger.info(f"Sending request to Ollama model '{settings.OLLAMA_MODEL}'")
-        response = ollama.chat(
-            model=settings.OLLAMA_MODEL,
-            messages=[
-                {'role': 'user', 'content': prompt}
-            ]
+def render_prompt(template: PromptTemplate, category: str, job_description: str, timeline: str) -> str:
+    return template.render(category=category, job_description=job_description, timeline=timeline)
+
+def get_prompt(category: str, job_description: str, timeline: str) -> str:
+    return render_prompt(load_prompt_template(category), category, job_description, timeline)
+
+def prepare_job_description(job_description: str) -> str:
+    """Canonical job description used for the prompt and every cache key."""
+    if not settings.JD_PREPROCESS_ENABLED:
+        return job_description
+    with metrics.timed("preprocess"):
+        prepared = preprocess_job_description(job_description, settings.JD_MAX_TOKENS)
+    metrics.JOB_DESCRIPTION_TOKENS.labels("raw").observe(estimate_tokens(job_description))
+    metrics.JOB_DESCRIPTION_TOKENS.labels("processed").observe(estimate_tokens(prepared))
+    return prepared
+
+def two_phase_enabled() -> bool:
+    return settings.GENERATION_MODE == "parallel"
+
+def plan_template_digest(template: PromptTemplate) -> str:
+    """Digest of everything that shapes a generated plan besides the inputs and the model tag."""
+    if not two_phase_enabled():
+        return template.digest
+    skills = load_template_file(settings.SKILLS_PROMPT_TEMPLATE_PATH)
+    topics = load_template_file(settings.TOPICS_PROMPT_TEMPLATE_PATH)
+    return f"parallel:{skills.digest}:{topics.digest}"
+
+def validate_plan(content) -> dict:
+    """Validate a parsed model response against CareerPlan, coercing e.g. "5" to 5, and drop extra fields."""
+    return CareerPlan.model_validate(content).model_dump()
+
+def prepare_plan_inputs(category: str, job_description: str, timeline: str) -> Tuple[str, str]:
+    """Return the prepared job description and the cache/coalescing key identifying the plan for these inputs."""
+    template = load_prompt_template(category)
+    job_description = prepare_job_description(job_description)
+    return job_description, make_cache_key(category, job_description, timeline, settings.OLLAMA_MODEL, plan_template_digest(template))
+
+def career_plan_key(category: str, job_description: str, timeline: str) -> str:
+    """Return the cache/coalescing key identifying the plan for these inputs."""
+    return prepare_plan_inputs(category, job_description, timeline)[1]
+
+async def get_career_plan(category: str, job_description: str, timeline: str, user_id: Optional[str] = None) -> dict:
+    _, plan = await _resolve_career_plan(category, job_description, timeline, user_id)
+    return plan
+
+async def get_prepared_career_plan(category: str, job_description: str, timeline: str, cache_key: str,
+                                   user_id: Optional[str] = None) -> dict:
+    """Like get_career_plan, for inputs already run through prepare_plan_inputs."""
+    return await _resolve_prepared_plan(category, job_description, timeline, cache_key, user_id)
+
+async def get_career_plan_body(category: str, job_description: str, timeline: str, user_id: Optional[str] = None) -> EncodedBody:
+    """The plan as a response body, serialized and compressed at most once per cached plan."""
+    cache_key, plan = await _resolve_career_plan(category, job_description, timeline, user_id)
+    body = plan_cache.encoded(cache_key, plan)
+    if body is None:
+        with metrics.timed("serialize"):
+            body = EncodedBody.from_content(plan)
+        plan_cache.attach_encoded(cache_key, plan, body)
+    return body
+
+async def _resolve_career_plan(category: str, job_description: str, timeline: str, user_id: Optional[str]) -> Tuple[str, dict]:
+    job_description, cache_key = prepare_plan_inputs(category, job_description, timeline)
+    return cache_key, await _resolve_prepared_plan(category, job_description, timeline, cache_key, user_id)
+
+async def _resolve_prepared_plan(category: str, job_description: str, timeline: str, cache_key: str, user_id: Optional[str]) -> dict:
+    remember = bool(user_id) and settings.USER_PLANS_ENABLED
+    if remember:
+        stored = await _stored_user_plan(user_id, cache_key)
+        if stored is not None:
+            logger.info("Serving career plan from the user's plan history")
+            if settings.PLAN_CACHE_ENABLED:
+                # Lets repeat deliveries reuse the encoded body kept with the in-memory entry
+                plan_cache.warm(cache_key, stored)
+            return stored
+
+    template = load_prompt_template(category)
+    plan = await _cached_or_generated_plan(template, category, job_description, timeline, cache_key, user_id)
+    await store_user_plan(user_id, cache_key, category, job_description, timeline, plan)
+    return plan
+
+async def store_user_plan(user_id: Optional[str], cache_key: str, category: str, job_description: str, timeline: str,
+                          plan: dict) -> None:
+    """Add a plan to the user's history; store failures are logged and never fail the request."""
+    if not user_id or not settings.USER_PLANS_ENABLED:
+        return
+    try:
+        await user_plans.save(user_id, cache_key, category, timeline, job_description, plan)
+    except sqlite3.Error as e:
+        logger.warning(f"Failed to store career plan for user: {str(e)}")
+
+async def _stored_user_plan(user_id: str, cache_key: str) -> Optional[dict]:
+    """The plan this user already has for these inputs; store failures only skip the lookup."""
+    try:
+        stored = await user_plans.find(user_id, cache_key)
+    except sqlite3.Error as e:
+        logger.warning(f"User plan lookup failed: {str(e)}")
+        return None
+    metrics.CACHE_LOOKUPS.labels("user_plan_hit" if stored is not None else "user_plan_miss").inc()
+    return orjson.loads(stored["plan_json"]) if stored is not None else None
+
+async def _cached_or_generated_plan(template: PromptTemplate, category: str, job_description: str, timeline: str,
+                                    cache_key: str, user_id: Optional[str]) -> dict:
+    if settings.PLAN_CACHE_ENABLED:
+        with metrics.timed("cache"):
+            cached = await plan_cache.get(cache_key)
+        metrics.CACHE_LOOKUPS.labels("hit" if cached is not None else "miss").inc()
+        if cached is not None:
+            logger.info("Serving career plan from cache")
+            return cached
+
+    if plan_requests.in_flight(cache_key):
+        logger.info("Identical career plan request in flight, awaiting its result")
+    return await plan_requests.do(
+        cache_key, lambda: _generate_plan(template, category, job_description, timeline, cache_key, user_id)
+    )
+
+async def generate_career_plan_logic(category: str, job_description: str, timeline: str, user_id: Optional[str] = None,
+                                     timeout: Optional[float] = None,
+                                     is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+                                     accept_encoding: Optional[str] = None):
+    try:
+        body = await run_cancellable(
+            get_career_plan_body(category, job_description, timeline, user_id),
+            timeout=timeout, is_disconnected=is_disconnected, poll_interval=settings.DISCONNECT_POLL_INTERVAL,
         )
-        logger.info("Received response from Ollama")
-        
-        content = response['message']['content']
-        
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-             content = content.split("```")[1].split("```")[0].strip()
-        
-        parsed_content = json.loads(content)
+    except RequestCancelled as e:
+        if e.reason == DEADLINE:
+            raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Request deadline exceeded")
+        # Nobody is listening any more; 499 only shows up in access logs and metrics
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    return await encoded_json_response(body, accept_encoding, status_code=status.HTTP_200_OK)
+
+async def _semantic_lookup(category: str, job_description: str, timeline: str, scope: str):
+    """Return (plan, query vector) for a near-duplicate request; embedding failures only disable the lookup."""
+    try:
+        with metrics.timed("semantic_cache"):
+            vectors = await semantic_cache.embed([semantic_cache_text(category, job_description, timeline)])
+            similar = semantic_cache.match(vectors, scope)[0]
+    except Exception as e:
+        logger.warning(f"Semantic cache lookup failed: {str(e)}")
+        return None, None
+    metrics.CACHE_LOOKUPS.labels("semantic_hit" if similar is not None else "semantic_miss").inc()
+    return similar, vectors[0]
+
+async def _generate_plan(template: PromptTemplate, category: str, job_description: str, timeline: str, cache_key: str, user_id: Optional[str]) -> dict:
+    semantic_scope = semantic_cache_scope(category, timeline, settings.OLLAMA_MODEL, plan_template_digest(template))
+    semantic_vector = None
+    if settings.SEMANTIC_CACHE_ENABLED:
+        similar, semantic_vector = await _semantic_lookup(category, job_description, timeline, semantic_scope)
+        if similar is not None:
+            logger.info("Serving career plan from semantic cache")
+            if settings.PLAN_CACHE_ENABLED:
+                await plan_cache.set(cache_key, similar)
+            return similar
+
+    try:
+        if two_phase_enabled():
+            parsed_content = validate_plan(await generate_plan_two_phase(
+                load_template_file(settings.SKILLS_PROMPT_TEMPLATE_PATH),
+                load_template_file(settings.TOPICS_PROMPT_TEMPLATE_PATH),
+                category, job_description, timeline, user_id,
+            ))
+        else:
+            parsed_content = await _generate_plan_single(template, category, job_description, timeline, user_id)
         logger.info("Successfully parsed JSON response")
-        return JSONResponse(content=parsed_content,status_code=status.HTTP_200_OK)
+        if settings.PLAN_CACHE_ENABLED:
+            await plan_cache.set(cache_key, parsed_content)
+        if semantic_vector is not None:
+            semantic_cache.add(semantic_vector, semantic_scope, parsed_content)
+        return parsed_content
 
+    except AdmissionRejected as e:
+        raise _admission_error(e)
+    except ValidationError as e:
+        metrics.SCHEMA_FAILURES.inc()
+        logger.error(f"Model response does not match the career plan schema: {str(e)}")
+        raise HTTPException(status_code=500, detail="Model response does not match the career plan schema")
     except json.JSONDecodeError:
+        metrics.PARSE_FAILURES.inc()
         logger.error("Failed to parse JSON from model response")
-        logger.error(f"Raw response content: {response['message']['content']}")
-        traceback.print_exc()
         raise HTTPException(status_code=500, detail="Failed to parse JSON from model response")
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"An error occurred during processing: {str(e)}")
-        traceback.print_exc()
+        logger.error(f"An error occurred during processing: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+
+async def _generate_plan_single(template: PromptTemplate, category: str, job_description: str, timeline: str, user_id: Optional[str]) -> dict:
+    with metrics.timed("prompt"):
+        prompt = render_prompt(template, category, job_description, timeline)
+    logger.info("Prompt generated successfully")
+    log_payload(logger, logging.DEBUG, "Rendered prompt", prompt)
+
+    queued_at = time.perf_counter()
+    async with plan_scheduler.slot(user_id), get_backend_pool().lease() as backend:
+        metrics.record_stage("queue", time.perf_counter() - queued_at)
+        logger.info(f"Sending request to Ollama model '{settings.OLLAMA_MODEL}' on '{backend.name}'")
+        with metrics.timed("model"):
+            response = await backend.client.chat(
+                model=settings.OLLAMA_MODEL,
+                messages=[
+                    {'role': 'user', 'content': prompt}
+                ],
+                format=CAREER_PLAN_SCHEMA,
+                **model_request_options()
+            )
+    logger.info("Received response from Ollama")
+    metrics.record_ollama_response(response)
+
+    content = response['message']['content']
+    try:
+        with metrics.timed("parse"):
+            return validate_plan(parse_model_json(content))
+    except json.JSONDecodeError:
+        log_payload(logger, logging.ERROR, "Raw model response", content)
+        raise
+
+async def stream_career_plan_logic(category: str, job_description: str, timeline: str, user_id: Optional[str] = None):
+    template = load_prompt_template(category)
+    job_description, history_key = prepare_plan_inputs(category, job_description, timeline)
+    # Streaming always generates in one completion, so its plans are cached under the single-mode key
+    cache_key = make_cache_key(category, job_description, timeline, settings.OLLAMA_MODEL, template.digest)
+    cached = await plan_cache.get(cache_key) if settings.PLAN_CACHE_ENABLED else None
+    if cached is not None:
+        logger.info("Streaming career plan from cache")
+        events = _cached_plan_events(cached)
+    else:
+        # Reject before the 200 status line is sent; the slot itself is taken once streaming starts
+        try:
+            plan_scheduler.admit(user_id)
+        except AdmissionRejected as e:
+            raise _admission_error(e)
+        events = _stream_plan_events(template, category, job_description, timeline, cache_key, user_id)
+    events = _store_streamed_plan(events, user_id, history_key, category, job_description, timeline)
+    return StreamingResponse(_ndjson(events), media_type="application/x-ndjson")
+
+async def _store_streamed_plan(events, user_id: Optional[str], cache_key: str, category: str, job_description: str, timeline: str):
+    async for event in events:
+        yield event
+        # The final event carries the validated plan; store it once it has been sent
+        if event["event"] == "plan":
+            await store_user_plan(user_id, cache_key, category, job_description, timeline, event["data"])
+
+async def _ndjson(events):
+    async for event in events:
+        yield orjson.dumps(event) + b"\n"
+
+async def _cached_plan_events(plan: dict):
+    for index, skill in enumerate(plan.get("skills", [])):
+        yield {"event": "skill", "index": index, "data": skill}
+    yield {"event": "plan", "data": plan}
+
+async def _stream_plan_events(template: PromptTemplate, category: str, job_description: str, timeline: str, cache_key: str, user_id: Optional[str]):
+    prompt = render_prompt(template, category, job_description, timeline)
+    logger.info("Prompt generated successfully")
+    log_payload(logger, logging.DEBUG, "Rendered prompt", prompt)
+    parser = IncrementalPlanParser()
+
+    try:
+        queued_at = time.perf_counter()
+        async with plan_scheduler.slot(user_id), get_backend_pool().lease() as backend:
+            metrics.record_stage("queue", time.perf_counter() - queued_at)
+            logger.info(f"Streaming request to Ollama model '{settings.OLLAMA_MODEL}' on '{backend.name}'")
+            stream = await backend.client.chat(
+                model=settings.OLLAMA_MODEL,
+                messages=[
+                    {'role': 'user', 'content': prompt}
+                ],
+                format=CAREER_PLAN_SCHEMA,
+                stream=True,
+                **model_request_options()
+            )
+            async for chunk in stream:
+                for event in parser.feed(chunk['message']['content']):
+                    yield event
+                if chunk.get('done'):
+                    metrics.record_ollama_response(chunk)
+        logger.info("Ollama stream completed")
+
+        parsed_content = validate_plan(parser.result())
+        logger.info("Successfully parsed streamed JSON response")
+        if settings.PLAN_CACHE_ENABLED:
+            await plan_cache.set(cache_key, parsed_content)
+        yield {"event": "plan", "data": parsed_content}
+
+    except AdmissionRejected as e:
+        yield {"event": "error", "detail": e.detail}
+    except ValidationError as e:
+        metrics.SCHEMA_FAILURES.inc()
+        logger.error(f"Streamed model response does not match the career plan schema: {str(e)}")
+        yield {"event": "error", "detail": "Model response does not match the career plan schema"}
+    except json.JSONDecodeError:
+        metrics.PARSE_FAILURES.inc()
+        logger.error("Failed to parse JSON from streamed model response")
+        log_payload(logger, logging.ERROR, "Raw streamed model response", parser.text)
+        yield {"event": "error", "detail": "Failed to parse JSON from model response"}
+    except Exception as e:
+        logger.error(f"An error occurred during streaming: {str(e)}", exc_info=True)
+        yield {"event": "error", "detail": str(e)}
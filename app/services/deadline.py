@@ -0,0 +1,63 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from app.core import metrics
+
+logger = logging.getLogger(__name__)
+
+DISCONNECT = "client_disconnect"
+DEADLINE = "deadline"
+
+class RequestCancelled(Exception):
+    """Raised when work was abandoned because the client left or the request deadline passed."""
+
+    def __init__(self, reason: str, elapsed: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.elapsed = elapsed
+
+def effective_timeout(server_timeout: float, client_timeout: Optional[float]) -> Optional[float]:
+    """The tighter of the server's limit (0 = none) and the client's requested timeout."""
+    limits = [limit for limit in (server_timeout, client_timeout) if limit]
+    return min(limits) if limits else None
+
+async def run_cancellable(work: Awaitable[Any], timeout: Optional[float] = None,
+                          is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+                          poll_interval: float = 0.5) -> Any:
+    """Await ``work`` unless the deadline passes or the client disconnects, cancelling it if so.
+
+    Cancelling ``work`` propagates down to the in-flight Ollama call, which closes its connection
+    and stops the generation on the server.
+    """
+    start = time.monotonic()
+    task = asyncio.ensure_future(work)
+    try:
+        while True:
+            wait = poll_interval if is_disconnected is not None else None
+            if timeout is not None:
+                remaining = timeout - (time.monotonic() - start)
+                wait = remaining if wait is None else min(wait, remaining)
+            done, _ = await asyncio.wait({task}, timeout=max(wait, 0) if wait is not None else None)
+            if done:
+                return task.result()
+            if timeout is not None and time.monotonic() - start >= timeout:
+                reason = DEADLINE
+                break
+            if is_disconnected is not None and await is_disconnected():
+                reason = DISCONNECT
+                break
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    raise record_cancellation(reason, time.monotonic() - start)
+
+def record_cancellation(reason: str, elapsed: float) -> RequestCancelled:
+    """Count and log abandoned work; returns the exception for the caller to raise."""
+    metrics.CANCELLED_REQUESTS.labels(reason).inc()
+    metrics.CANCELLED_REQUEST_SECONDS.labels(reason).observe(elapsed)
+    logger.warning(f"Career plan request cancelled ({reason}) after {elapsed:.2f}s; in-flight generation aborted")
+    return RequestCancelled(reason, elapsed)
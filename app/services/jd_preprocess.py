@@ -0,0 +1,137 @@
+import html
+import re
+from typing import List
+
+# Elements whose content is never part of the posting text
+_INVISIBLE = re.compile(r"<(script|style|head)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+# Block-level tags become line breaks so list items and paragraphs stay on separate lines
+_BLOCK_TAG = re.compile(r"<\s*/?\s*(br|p|div|li|ul|ol|tr|h[1-6]|section|article|header|footer)\b[^>]*>", re.IGNORECASE)
+# Remaining tags of known HTML elements only, so "<5 years" or "Map<String, List<Integer>>" survive;
+# single-letter elements must be lowercase so generic parameters such as "<T>" or "<B>" are kept too
+_TAG = re.compile(
+    r"</?(?:[abiqsu]|(?i:abbr|address|area|aside|big|blockquote|body|button|caption|center|cite|code|col|colgroup|"
+    r"dd|del|details|dfn|dl|dt|em|embed|figcaption|figure|font|form|hr|html|iframe|img|input|ins|kbd|label|link|"
+    r"main|mark|meta|nav|noscript|pre|samp|small|source|span|strike|strong|sub|summary|sup|svg|table|tbody|td|"
+    r"template|tfoot|th|thead|time|title|tt|var|wbr))\b(?:\s[^<>]*)?/?>"
+)
+_MARKDOWN_EMPHASIS = re.compile(r"(\*\*|__|`)")
+_BULLET = re.compile(r"^(?:[-*+•●▪◦·]|\d+[.)])\s+")
+_HEADING_MARKER = re.compile(r"^#{1,6}\s*")
+_SPACES = re.compile(r"[ \t ​]+")
+
+# Headings that open sections with no bearing on the skills a role requires
+_BOILERPLATE_HEADING = re.compile(
+    r"^(?:benefits?|perks?(?: and benefits)?|what we offer|why (?:join us|work (?:here|with us))|"
+    r"about (?:us|the company|our company)|our (?:culture|values|mission)|life at \w+|"
+    r"equal (?:employment )?opportunity.*|eeo(?: statement)?|diversity(?:,? equity)?(?: (?:and|&) inclusion)?|"
+    r"accommodations?|privacy notice|how to apply|compensation(?: and benefits)?|salary|pay range)\s*:?$",
+    re.IGNORECASE,
+)
+# Stand-alone legal sentences that appear outside of a dedicated section
+_BOILERPLATE_LINE = re.compile(
+    r"equal (?:employment )?opportunity employer|without regard to (?:race|age|sex)|"
+    r"regardless of (?:race|age|sex|gender)|reasonable accommodation|e-verify|"
+    r"applicants? (?:will|shall) receive consideration|protected (?:veteran|characteristic)",
+    re.IGNORECASE,
+)
+# Section headings that carry the requirements; they also end a boilerplate section
+_ROLE_HEADING = re.compile(
+    r"^(?:about the (?:role|position|job)|(?:key )?responsibilities|requirements|(?:minimum |preferred )?qualifications|"
+    r"(?:required |preferred )?skills|what you(?:'ll| will) do|what you(?:'ll| will) (?:need|bring)|"
+    r"who you are|(?:the )?role|nice to have|bonus points|tech(?:nology)? stack)\s*:?$",
+    re.IGNORECASE,
+)
+# Subword-ish pieces as BPE tokenizers split them: letter runs (long words split every 8 chars),
+# up to three digits, or a single symbol
+_TOKEN = re.compile(r"[^\W\d_]{1,8}|\d{1,3}|[^\w\s]", re.UNICODE)
+
+_MAX_HEADING_CHARS = 60
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local estimate of the model's token count; errs on the high side for English prose."""
+    return len(_TOKEN.findall(text))
+
+def strip_markup(text: str) -> str:
+    """Remove HTML tags, comments, scripts and Markdown emphasis, keeping block structure as line breaks."""
+    text = _COMMENT.sub(" ", text)
+    text = _INVISIBLE.sub(" ", text)
+    text = _BLOCK_TAG.sub("\n", text)
+    text = _TAG.sub(" ", text)
+    text = html.unescape(text)
+    return _MARKDOWN_EMPHASIS.sub("", text)
+
+def _is_heading(line: str, marked: bool) -> bool:
+    if len(line) > _MAX_HEADING_CHARS:
+        return False
+    # All-caps only counts for multi-word lines, so acronyms such as "PTO" stay inside their section
+    shouted = line.isupper() and " " in line
+    return marked or shouted or line.endswith(":") or _ROLE_HEADING.match(line) is not None
+
+def _clean_lines(text: str) -> List[str]:
+    """Normalize whitespace and bullets, drop boilerplate sections and repeated lines."""
+    lines: List[str] = []
+    seen = set()
+    in_boilerplate = False
+    for raw in text.splitlines():
+        line = _SPACES.sub(" ", raw).strip()
+        marked = _HEADING_MARKER.match(line) is not None
+        line = _HEADING_MARKER.sub("", line)
+        if not line:
+            continue
+        bulleted = _BULLET.match(line) is not None
+        line = _BULLET.sub("- ", line)
+        if not bulleted and _BOILERPLATE_HEADING.match(line):
+            in_boilerplate = True
+            continue
+        if in_boilerplate:
+            # A boilerplate section runs until the next heading that is not itself boilerplate
+            if bulleted or not _is_heading(line, marked):
+                continue
+            in_boilerplate = False
+        if _BOILERPLATE_LINE.search(line):
+            continue
+        key = line.casefold()
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+    return lines
+
+def truncate_to_budget(lines: List[str], max_tokens: int) -> List[str]:
+    """Keep whole lines, in order, until the token budget is spent; a line that would overflow is cut at a word."""
+    if max_tokens <= 0:
+        return lines
+    kept: List[str] = []
+    remaining = max_tokens
+    for line in lines:
+        cost = estimate_tokens(line) + 1  # +1 for the line break
+        if cost <= remaining:
+            kept.append(line)
+            remaining -= cost
+            continue
+        words: List[str] = []
+        for word in line.split(" "):
+            cost = estimate_tokens(word)
+            if cost > remaining:
+                break
+            words.append(word)
+            remaining -= cost
+        if words:
+            kept.append(" ".join(words))
+        break
+    return kept
+
+def preprocess_job_description(text: str, max_tokens: int = 0) -> str:
+    """Reduce a job posting to its canonical, prompt-ready form.
+
+    Markup is stripped, boilerplate sections (benefits, EEO statements, company blurbs) are dropped,
+    whitespace and bullets are normalized, repeated lines are removed and the result is cut to
+    ``max_tokens`` estimated tokens (0 disables the budget). Postings that differ only in these
+    respects map to the same text, and therefore to the same plan cache key. If everything would be
+    dropped the whitespace-normalized text is used instead, so a request is never emptied.
+    """
+    lines = _clean_lines(strip_markup(text))
+    if not lines:
+        lines = [" ".join(text.split())]
+    return "\n".join(truncate_to_budget(lines, max_tokens))
@@ -0,0 +1,194 @@
+import json
+import re
+from typing import Any, Iterator, List, Optional
+
+import orjson
+
+_STRUCTURAL = re.compile(r'\\.|["{}]', re.DOTALL)
+_LITERAL = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null")
+_STRING_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+_CLOSERS = {"{": "}", "[": "]"}
+
+def iter_json_candidates(text: str) -> Iterator[str]:
+    """Yield each top-level brace-balanced ``{...}`` span in ``text``, in order, in a single scan.
+
+    Objects nested in a span are not yielded on their own. Braces inside JSON strings (including
+    backticks or braces in URLs) are ignored. If the text ends before an object closes, the
+    truncated tail is yielded as the last candidate.
+    """
+    start = text.find("{")
+    while start != -1:
+        depth = 0
+        in_string = False
+        end = -1
+        # Jump between structural characters in C instead of visiting every character in Python
+        for match in _STRUCTURAL.finditer(text, start):
+            token = match.group()
+            if token == '"':
+                in_string = not in_string
+            elif in_string or len(token) == 2:
+                continue
+            elif token == "{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    end = match.end()
+                    break
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = text.find("{", end)
+
+def repair_json(fragment: str) -> str:
+    """Best-effort repair of a model-produced JSON object.
+
+    Drops trailing commas, escapes raw control characters inside strings, fixes mismatched
+    closers and, if the object was truncated, closes every open container. A truncated array
+    keeps only its complete elements, so a half-written trailing object (a topic missing its
+    later fields) is dropped rather than closed as it stands; outside arrays the repair cuts
+    back to the last complete value.
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    expect_key: List[bool] = []
+    in_string = escape = string_is_key = False
+    token: List[str] = []
+    complete_len = 0
+    complete_stack: tuple = ()
+    # Per open container: output length after its last complete element (used for arrays)
+    element_ends: List[int] = []
+
+    def mark() -> None:
+        nonlocal complete_len, complete_stack
+        complete_len = len(out)
+        complete_stack = tuple(stack)
+
+    def value_done() -> None:
+        mark()
+        if stack and stack[-1] == "[":
+            element_ends[-1] = len(out)
+
+    def strip_trailing_comma() -> None:
+        while out and out[-1].isspace():
+            out.pop()
+        if out and out[-1] == ",":
+            out.pop()
+
+    for ch in fragment:
+        if in_string:
+            if escape:
+                escape = False
+                out.append(ch)
+            elif ch == "\\":
+                escape = True
+                out.append(ch)
+            elif ch == '"':
+                in_string = False
+                out.append(ch)
+                if not string_is_key:
+                    value_done()
+            else:
+                out.append(_STRING_ESCAPES.get(ch, ch))
+            continue
+
+        if token and (ch in ",}]:" or ch.isspace()):
+            if _LITERAL.fullmatch("".join(token)):
+                value_done()
+            token = []
+
+        if ch == '"':
+            in_string = True
+            string_is_key = bool(stack) and stack[-1] == "{" and expect_key[-1]
+            out.append(ch)
+        elif ch == "{" or ch == "[":
+            stack.append(ch)
+            expect_key.append(ch == "{")
+            out.append(ch)
+            element_ends.append(len(out))
+            mark()
+        elif ch == "}" or ch == "]":
+            if not stack:
+                break
+            strip_trailing_comma()
+            out.append(_CLOSERS[stack.pop()])
+            expect_key.pop()
+            element_ends.pop()
+            value_done()
+            if not stack:
+                return "".join(out)
+        elif ch == ",":
+            out.append(ch)
+            if stack and stack[-1] == "{":
+                expect_key[-1] = True
+        elif ch == ":":
+            out.append(ch)
+            if stack:
+                expect_key[-1] = False
+        elif ch.isspace():
+            out.append(ch)
+        else:
+            token.append(ch)
+            out.append(ch)
+
+    # Truncated inside an array: keep its complete elements and close everything around it
+    if "[" in stack:
+        depth = len(stack) - stack[::-1].index("[")
+        del out[element_ends[depth - 1]:]
+        strip_trailing_comma()
+        out.extend(_CLOSERS[opener] for opener in reversed(stack[:depth]))
+        return "".join(out)
+    # Otherwise finish a dangling value if it is usable, then close what is still open
+    if in_string and not string_is_key and not escape:
+        out.append('"')
+        mark()
+    elif token and _LITERAL.fullmatch("".join(token)):
+        mark()
+    del out[complete_len:]
+    strip_trailing_comma()
+    out.extend(_CLOSERS[opener] for opener in reversed(complete_stack))
+    return "".join(out)
+
+def _loads_candidate(candidate: str) -> Any:
+    try:
+        return orjson.loads(candidate)
+    except orjson.JSONDecodeError as e:
+        try:
+            return orjson.loads(repair_json(candidate))
+        except orjson.JSONDecodeError:
+            raise e from None
+
+def parse_model_json(text: str, prefer_key: Optional[str] = "skills") -> Any:
+    """Parse the JSON object in a model completion, repairing common defects.
+
+    When the completion holds several objects (e.g. a schema example before the answer), the first
+    one with a ``prefer_key`` member wins, otherwise the largest one that parses.
+
+    Raises ``json.JSONDecodeError`` (``orjson.JSONDecodeError`` is a subclass) if no candidate parses.
+    """
+    # Fast path: the completion is usually one object with at most some prose or fences around it
+    first, last = text.find("{"), text.rfind("}")
+    if first != -1 and last > first:
+        try:
+            return orjson.loads(text[first:last + 1])
+        except orjson.JSONDecodeError:
+            pass
+
+    error = None
+    best, best_size = None, -1
+    for candidate in iter_json_candidates(text):
+        try:
+            parsed = _loads_candidate(candidate)
+        except orjson.JSONDecodeError as e:
+            error = error or e
+            continue
+        if prefer_key is not None and isinstance(parsed, dict) and prefer_key in parsed:
+            return parsed
+        if len(candidate) > best_size:
+            best, best_size = parsed, len(candidate)
+    if best_size >= 0:
+        return best
+    if error is None:
+        raise json.JSONDecodeError("No JSON object in model response", text, 0)
+    raise error
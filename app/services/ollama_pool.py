@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+import httpx
+import ollama
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def model_request_options() -> Dict[str, Any]:
+    """keep_alive and runtime options sent with every model call.
+
+    Warm-up and generation must use the same options, otherwise Ollama reloads the model
+    (for example when num_ctx differs).
+    """
+    kwargs: Dict[str, Any] = {"keep_alive": settings.OLLAMA_KEEP_ALIVE}
+    if settings.OLLAMA_NUM_CTX > 0:
+        kwargs["options"] = {"num_ctx": settings.OLLAMA_NUM_CTX}
+    return kwargs
+
+def _with_tag(model: str) -> str:
+    return model if ":" in model else f"{model}:latest"
+
+def is_model_loaded(running: Any, model: str) -> bool:
+    """Whether an ``ollama ps`` response lists ``model`` (an untagged name means ``:latest``)."""
+    wanted = _with_tag(model)
+    for entry in running.get("models") or []:
+        if _with_tag(entry.get("model") or entry.get("name") or "") == wanted:
+            return True
+    return False
+
+def is_backend_failure(error: BaseException) -> bool:
+    """Whether an error means the host itself is unhealthy, as opposed to a bad request or model output."""
+    if isinstance(error, (httpx.TransportError, ConnectionError)):
+        return True
+    return isinstance(error, ollama.ResponseError) and error.status_code >= 500
+
+class Backend:
+    """One Ollama host with its own persistent client and connection pool."""
+
+    def __init__(self, host: Optional[str], max_connections: int):
+        self.host = host
+        self.client = ollama.AsyncClient(
+            host=host,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        self.outstanding = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.warm = False
+
+    @property
+    def name(self) -> str:
+        return self.host or "default"
+
+    def available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+    async def close(self) -> None:
+        """Close the client's connection pool; older ollama releases have no public close()."""
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            await close()
+        else:
+            await self.client._client.aclose()
+
+class BackendPool:
+    """Route model calls across Ollama hosts by least outstanding requests.
+
+    Hosts that fail ``eject_after`` consecutive requests or health checks are ejected for
+    ``eject_seconds``. If every host is ejected, routing falls back to all of them rather than
+    failing outright.
+    """
+
+    def __init__(self, hosts: List[Optional[str]], max_connections: int = 16, eject_after: int = 3, eject_seconds: float = 30.0):
+        self.backends = [Backend(host, max_connections) for host in (hosts or [None])]
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self._health_task: Optional[asyncio.Task] = None
+        self._rotation = 0
+
+    @classmethod
+    def from_settings(cls) -> "BackendPool":
+        return cls(
+            hosts=list(settings.OLLAMA_HOSTS),
+            max_connections=settings.OLLAMA_MAX_CONNECTIONS_PER_HOST,
+            eject_after=settings.OLLAMA_EJECT_AFTER_FAILURES,
+            eject_seconds=settings.OLLAMA_EJECT_SECONDS,
+        )
+
+    def pick(self) -> Backend:
+        now = time.monotonic()
+        candidates = [backend for backend in self.backends if backend.available(now)] or self.backends
+        # Rotate the starting point so ties are spread evenly instead of always hitting the first host
+        self._rotation = (self._rotation + 1) % len(candidates)
+        ordered = candidates[self._rotation:] + candidates[:self._rotation]
+        return min(ordered, key=lambda backend: backend.outstanding)
+
+    @asynccontextmanager
+    async def lease(self):
+        """Reserve the least loaded backend for the duration of one model call."""
+        backend = self.pick()
+        backend.outstanding += 1
+        try:
+            yield backend
+        except BaseException as e:
+            if is_backend_failure(e):
+                self.record_failure(backend, e)
+            raise
+        else:
+            self.record_success(backend)
+        finally:
+            backend.outstanding -= 1
+
+    def record_success(self, backend: Backend) -> None:
+        if backend.failures or backend.ejected_until:
+            logger.info(f"Ollama backend '{backend.name}' is healthy again")
+        backend.failures = 0
+        backend.ejected_until = 0.0
+
+    def record_failure(self, backend: Backend, error: BaseException) -> None:
+        backend.failures += 1
+        if backend.failures >= self.eject_after:
+            backend.ejected_until = time.monotonic() + self.eject_seconds
+            logger.warning(f"Ejecting Ollama backend '{backend.name}' for {self.eject_seconds}s: {str(error)}")
+
+    async def check_health(self, timeout: float) -> None:
+        """Probe every host; also refresh whether it still has the configured model loaded."""
+        async def probe(backend: Backend) -> None:
+            try:
+                running = await asyncio.wait_for(backend.client.ps(), timeout)
+            except Exception as e:
+                backend.warm = False
+                self.record_failure(backend, e)
+            else:
+                backend.warm = is_model_loaded(running, settings.OLLAMA_MODEL)
+                self.record_success(backend)
+
+        await asyncio.gather(*(probe(backend) for backend in self.backends))
+
+    def start_health_checks(self, interval: float, timeout: float) -> None:
+        if interval <= 0 or self._health_task is not None:
+            return
+
+        async def run() -> None:
+            while True:
+                await self.check_health(timeout)
+                await asyncio.sleep(interval)
+
+        self._health_task = asyncio.create_task(run())
+
+    async def close(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        for backend in self.backends:
+            await backend.close()
+
+# The pool's HTTP clients are bound to the event loop they were first used on,
+# so the pool is (re)created whenever the running loop changes.
+_pool: Optional[BackendPool] = None
+_loop = None
+
+def get_backend_pool() -> BackendPool:
+    """Return the backend pool for the running loop."""
+    global _pool, _loop
+    loop = asyncio.get_running_loop()
+    if _loop is not loop:
+        _pool = BackendPool.from_settings()
+        _loop = loop
+    return _pool
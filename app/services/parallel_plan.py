@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.logging import log_payload
+from app.schemas.plan import SkillOutline, SkillOutlinePlan, SkillTopics
+from app.services.json_extract import parse_model_json
+from app.services.ollama_pool import get_backend_pool, model_request_options
+from app.services.plan_cache import make_cache_key, plan_cache
+from app.services.prompt_template import PromptTemplate
+from app.services.scheduler import plan_scheduler
+from app.services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+SKILL_OUTLINE_SCHEMA = SkillOutlinePlan.model_json_schema()
+SKILL_TOPICS_SCHEMA = SkillTopics.model_json_schema()
+
+# Concurrent plans that need the same skill breakdown share one generation
+skill_requests = SingleFlight()
+
+def skill_topics_key(category: str, skill: SkillOutline, template: PromptTemplate) -> str:
+    """Cache key of one skill's topics; independent of the job description the skill came from."""
+    return make_cache_key(category, skill.skill_name, f"{skill.total_days} days", settings.OLLAMA_MODEL, template.digest)
+
+async def _complete(prompt: str, schema: dict, user_id: Optional[str], stage: str) -> dict:
+    """Run one constrained completion in a reserved scheduler slot and return the parsed JSON."""
+    queued_at = time.perf_counter()
+    async with plan_scheduler.slot(user_id, reserved=True), get_backend_pool().lease() as backend:
+        metrics.record_stage("queue", time.perf_counter() - queued_at)
+        logger.info(f"Sending {stage} request to Ollama model '{settings.OLLAMA_MODEL}' on '{backend.name}'")
+        with metrics.timed(stage):
+            response = await backend.client.chat(
+                model=settings.OLLAMA_MODEL,
+                messages=[
+                    {'role': 'user', 'content': prompt}
+                ],
+                format=schema,
+                **model_request_options()
+            )
+    metrics.record_ollama_response(response)
+    content = response['message']['content']
+    try:
+        with metrics.timed("parse"):
+            return parse_model_json(content)
+    except ValueError:
+        log_payload(logger, logging.ERROR, f"Raw {stage} response", content)
+        raise
+
+async def _skill_topics(topics_template: PromptTemplate, category: str, skill: SkillOutline, user_id: Optional[str]) -> list:
+    cache_key = skill_topics_key(category, skill, topics_template)
+    if settings.PLAN_CACHE_ENABLED:
+        cached = await plan_cache.get(cache_key)
+        metrics.CACHE_LOOKUPS.labels("skill_hit" if cached is not None else "skill_miss").inc()
+        if cached is not None:
+            return cached["topics"]
+
+    async def generate() -> dict:
+        prompt = topics_template.render(category=category, skill_name=skill.skill_name, total_days=str(skill.total_days))
+        topics = SkillTopics.model_validate(await _complete(prompt, SKILL_TOPICS_SCHEMA, user_id, "model_topics")).model_dump()
+        if settings.PLAN_CACHE_ENABLED:
+            await plan_cache.set(cache_key, topics)
+        return topics
+
+    return (await skill_requests.do(cache_key, generate))["topics"]
+
+async def generate_plan_two_phase(skills_template: PromptTemplate, topics_template: PromptTemplate, category: str,
+                                  job_description: str, timeline: str, user_id: Optional[str]) -> dict:
+    """Generate a plan as a short skill extraction followed by concurrent per-skill topic breakdowns.
+
+    The request is admitted once for ``user_id``; all of its model calls then share the global
+    concurrency limit, so the topic calls run as wide as free slots and backends allow. The merged
+    result has the same shape as a single-completion plan.
+    """
+    async with plan_scheduler.reservation(user_id):
+        prompt = skills_template.render(category=category, job_description=job_description, timeline=timeline)
+        log_payload(logger, logging.DEBUG, "Rendered skills prompt", prompt)
+        outline = SkillOutlinePlan.model_validate(await _complete(prompt, SKILL_OUTLINE_SCHEMA, user_id, "model_skills"))
+        logger.info(f"Extracted {len(outline.skills)} skills, generating topics concurrently")
+
+        topics = await asyncio.gather(
+            *(_skill_topics(topics_template, category, skill, user_id) for skill in outline.skills)
+        )
+    return {
+        "skills": [
+            {"skill_name": skill.skill_name, "total_days": skill.total_days, "topics": skill_topics}
+            for skill, skill_topics in zip(outline.skills, topics)
+        ]
+    }
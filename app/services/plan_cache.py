@@ -0,0 +1,145 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import orjson
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def _normalize(value: str, casefold: bool = False) -> str:
+    value = " ".join(value.split())
+    return value.casefold() if casefold else value
+
+def make_cache_key(category: str, job_description: str, timeline: str, model: str, template_hash: str) -> str:
+    """Build a stable cache key from the normalized inputs, the model tag and the prompt template digest."""
+    payload = json.dumps(
+        [
+            _normalize(category, casefold=True),
+            _normalize(job_description),
+            _normalize(timeline, casefold=True),
+            model,
+            template_hash,
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class PlanCache:
+    """LRU/TTL cache of generated plans with an optional SQLite-backed persistent tier.
+
+    In-memory entries can also hold the plan's serialized (and compressed) response body, so repeat
+    deliveries skip encoding; the body is dropped whenever the plan for the key changes.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 86400, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS plan_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        now = time.time()
+        if entry is not None:
+            expires_at, value, _ = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+
+        if self._db is None:
+            return None
+        row = await asyncio.to_thread(self._db_get, key)
+        if row is None:
+            return None
+        expires_at, value = row
+        if expires_at <= now:
+            return None
+        self._remember(key, expires_at, value)
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, expires_at, value)
+        if self._db is not None:
+            try:
+                await asyncio.to_thread(self._db_set, key, value, expires_at)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to persist plan cache entry: {str(e)}")
+
+    def warm(self, key: str, value: Dict[str, Any]) -> None:
+        """Keep ``value`` in memory for ``key`` unless an entry exists already (the persistent tier is not written)."""
+        if key not in self._entries:
+            self._remember(key, time.time() + self.ttl_seconds, value)
+
+    def encoded(self, key: str, value: Dict[str, Any]) -> Optional[Any]:
+        """The response body attached to ``key``, provided it was encoded from a plan equal to ``value``."""
+        entry = self._entries.get(key)
+        if entry is None or entry[2] is None:
+            return None
+        if entry[1] is not value and entry[1] != value:
+            return None
+        return entry[2]
+
+    def attach_encoded(self, key: str, value: Dict[str, Any], body: Any) -> None:
+        """Store the response body encoded from ``value`` next to the cached plan, if it is still cached."""
+        entry = self._entries.get(key)
+        if entry is not None and (entry[1] is value or entry[1] == value):
+            self._entries[key] = (entry[0], entry[1], body)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM plan_cache")
+                self._db.commit()
+
+    def _remember(self, key: str, expires_at: float, value: Dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (expires_at, value, None)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _db_get(self, key: str) -> Optional[tuple]:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT expires_at, value FROM plan_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], orjson.loads(row[1])
+
+    def _db_set(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO plan_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, orjson.dumps(value).decode("utf-8"), expires_at),
+            )
+            # Expired rows are purged on write so the persistent tier stays bounded by the TTL
+            self._db.execute("DELETE FROM plan_cache WHERE expires_at <= ?", (time.time(),))
+            self._db.commit()
+
+plan_cache = PlanCache(
+    max_entries=settings.PLAN_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PLAN_CACHE_TTL_SECONDS,
+    db_path=settings.PLAN_CACHE_DB_PATH or None,
+)
@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import orjson
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.schemas.job import JobRequest
+from app.services.career_service import get_career_plan
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+_COLUMNS = "id, user_id, status, request, result, status_code, detail, created_at, updated_at"
+
+class PlanJobStore:
+    """SQLite-backed store of asynchronous career plan jobs, indexed by user_id."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS plan_jobs ("
+                "id TEXT PRIMARY KEY, user_id TEXT NOT NULL, status TEXT NOT NULL, request TEXT NOT NULL, "
+                "result TEXT, status_code INTEGER, detail TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS plan_jobs_user ON plan_jobs (user_id, created_at)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS plan_jobs_status ON plan_jobs (status)")
+            self._db.commit()
+        return self._db
+
+    async def create(self, request: JobRequest) -> Dict[str, Any]:
+        now = time.time()
+        job = {
+            "id": uuid.uuid4().hex, "user_id": request.user_id, "status": QUEUED,
+            "request": request.model_dump(), "result": None, "status_code": None, "detail": None,
+            "created_at": now, "updated_at": now,
+        }
+        await asyncio.to_thread(self._insert, job)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._select_one, job_id)
+
+    async def update(self, job_id: str, status: str, result: Optional[dict] = None,
+                     status_code: Optional[int] = None, detail: Optional[str] = None) -> None:
+        await asyncio.to_thread(self._update, job_id, status, result, status_code, detail)
+
+    async def unfinished(self) -> List[str]:
+        """Ids of jobs that were queued or running, oldest first (used to resume after a restart)."""
+        return await asyncio.to_thread(self._select_unfinished)
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _insert(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            db = self._connect()
+            db.execute(
+                f"INSERT INTO plan_jobs ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job["id"], job["user_id"], job["status"], orjson.dumps(job["request"]).decode("utf-8"),
+                 None, None, None, job["created_at"], job["updated_at"]),
+            )
+            db.commit()
+
+    def _select_one(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connect().execute(f"SELECT {_COLUMNS} FROM plan_jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row[0], "user_id": row[1], "status": row[2], "request": orjson.loads(row[3]),
+            "result": orjson.loads(row[4]) if row[4] is not None else None,
+            "status_code": row[5], "detail": row[6], "created_at": row[7], "updated_at": row[8],
+        }
+
+    def _update(self, job_id: str, status: str, result: Optional[dict], status_code: Optional[int], detail: Optional[str]) -> None:
+        with self._lock:
+            db = self._connect()
+            db.execute(
+                "UPDATE plan_jobs SET status = ?, result = ?, status_code = ?, detail = ?, updated_at = ? WHERE id = ?",
+                (status, orjson.dumps(result).decode("utf-8") if result is not None else None,
+                 status_code, detail, time.time(), job_id),
+            )
+            db.commit()
+
+    def _select_unfinished(self) -> List[str]:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT id FROM plan_jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+class PlanJobWorkers:
+    """In-process worker pool that generates plans for queued jobs."""
+
+    def __init__(self, store: PlanJobStore, workers: int, max_pending: int):
+        self.store = store
+        self.workers = workers
+        self.max_pending = max_pending
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def started(self) -> bool:
+        return bool(self._tasks)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        """Start the workers and resume jobs left unfinished by a previous process."""
+        self._queue = asyncio.Queue()
+        resumed = await self.store.unfinished()
+        for job_id in resumed:
+            self._queue.put_nowait(job_id)
+        if resumed:
+            logger.info(f"Resuming {len(resumed)} unfinished career plan jobs")
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(max(1, self.workers))]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.store.close()
+
+    async def submit(self, request: JobRequest) -> Dict[str, Any]:
+        if not self.started:
+            raise HTTPException(status_code=503, detail="Job workers are not running")
+        if self.pending >= self.max_pending:
+            raise HTTPException(status_code=503, detail="Job queue is full, please retry later",
+                                headers={"Retry-After": str(settings.SCHEDULER_RETRY_AFTER_SECONDS)})
+        job = await self.store.create(request)
+        self._queue.put_nowait(job["id"])
+        return job
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Career plan job {job_id} crashed: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        job = await self.store.get(job_id)
+        if job is None:
+            return
+        request = JobRequest(**job["request"])
+        await self.store.update(job_id, RUNNING)
+        while True:
+            try:
+                plan = await get_career_plan(request.category, request.job_description, request.timeline, request.user_id)
+            except HTTPException as e:
+                if e.status_code in (429, 503):
+                    # Admission control pushed back; a queued job waits instead of failing
+                    await asyncio.sleep(int((e.headers or {}).get("Retry-After", 1)))
+                    continue
+                await self.store.update(job_id, FAILED, status_code=e.status_code, detail=str(e.detail))
+                return
+            except Exception as e:
+                await self.store.update(job_id, FAILED, status_code=500, detail=str(e))
+                return
+            await self.store.update(job_id, SUCCEEDED, result=plan, status_code=200)
+            return
+
+plan_jobs = PlanJobWorkers(
+    store=PlanJobStore(settings.JOBS_DB_PATH),
+    workers=settings.JOBS_WORKERS,
+    max_pending=settings.JOBS_MAX_PENDING,
+)
@@ -0,0 +1,140 @@
+import bisect
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+from app.services.json_extract import parse_model_json
+
+logger = logging.getLogger(__name__)
+
+class _Frame:
+    __slots__ = ("kind", "key", "start", "children")
+
+    def __init__(self, kind: str, key: Optional[str], start: int):
+        self.kind = kind
+        self.key = key
+        self.start = start
+        self.children = 0
+
+class IncrementalPlanParser:
+    """Scan a streamed model completion and emit each skill and topic object as soon as it closes.
+
+    Text before the first ``{`` (prose, code fences) and after the root object closes is ignored.
+    """
+
+    def __init__(self):
+        # Chunks are kept as-is and only joined when a completed fragment is sliced out,
+        # so feeding thousands of small tokens stays linear in the completion size.
+        self._chunks: List[str] = []
+        self._offsets: List[int] = []
+        self._length = 0
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._pending_key: Optional[str] = None
+        self.root_start: Optional[int] = None
+        self.root_end: Optional[int] = None
+
+    @property
+    def done(self) -> bool:
+        return self.root_end is not None
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume a chunk of completion text and return the events it completed."""
+        events: List[Dict[str, Any]] = []
+        if not chunk:
+            return events
+        base = self._length
+        self._chunks.append(chunk)
+        self._offsets.append(base)
+        self._length += len(chunk)
+        if self.done:
+            return events
+        for local, ch in enumerate(chunk):
+            i = base + local
+            if self.root_start is None:
+                if ch == "{":
+                    self.root_start = i
+                    self._stack.append(_Frame("obj", None, i))
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = self._slice(self._string_start, i + 1)
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch == ":":
+                self._pending_key = self._decode_key(self._last_string)
+            elif ch == "{" or ch == "[":
+                parent = self._stack[-1]
+                key = self._pending_key if parent.kind == "obj" else None
+                self._stack.append(_Frame("obj" if ch == "{" else "arr", key, i))
+                self._pending_key = None
+            elif ch == "}" or ch == "]":
+                frame = self._stack.pop()
+                if not self._stack:
+                    self.root_end = i + 1
+                    break
+                parent = self._stack[-1]
+                if frame.kind == "obj" and parent.kind == "arr":
+                    event = self._event_for(frame, parent, self._slice(frame.start, i + 1))
+                    if event is not None:
+                        events.append(event)
+                    parent.children += 1
+            elif ch == ",":
+                self._pending_key = None
+        return events
+
+    def result(self) -> Dict[str, Any]:
+        """Parse the root object, repairing it if needed; raises ``json.JSONDecodeError`` if that fails."""
+        if self.root_start is None:
+            raise json.JSONDecodeError("No JSON object in model response", self.text, 0)
+        end = self.root_end if self.root_end is not None else self._length
+        return parse_model_json(self._slice(self.root_start, end))
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    def _slice(self, start: int, end: int) -> str:
+        first = bisect.bisect_right(self._offsets, start) - 1
+        last = bisect.bisect_right(self._offsets, end - 1) - 1
+        joined = "".join(self._chunks[first:last + 1])
+        base = self._offsets[first]
+        return joined[start - base:end - base]
+
+    def _event_for(self, frame: _Frame, parent: _Frame, raw: str) -> Optional[Dict[str, Any]]:
+        depth = len(self._stack)
+        # root{ skills[ skill{ ...
+        if depth == 2 and parent.key == "skills":
+            event = {"event": "skill", "index": parent.children}
+        # root{ skills[ skill{ topics[ topic{ ...
+        elif depth == 4 and parent.key == "topics" and self._stack[1].key == "skills":
+            event = {"event": "topic", "skill_index": self._stack[1].children, "index": parent.children}
+        else:
+            return None
+        try:
+            event["data"] = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            logger.warning("Skipping malformed streamed plan fragment")
+            return None
+        return event
+
+    @staticmethod
+    def _decode_key(raw: Optional[str]) -> Optional[str]:
+        if raw is None:
+            return None
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return None
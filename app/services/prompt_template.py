@@ -0,0 +1,89 @@
+import hashlib
+import os
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+_PLACEHOLDER = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+class PromptTemplate:
+    """A prompt template pre-parsed into literal and placeholder segments."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        self._literals: List[str] = []
+        self._names: List[str] = []
+        pos = 0
+        for match in _PLACEHOLDER.finditer(text):
+            self._literals.append(text[pos:match.start()])
+            self._names.append(match.group(1))
+            pos = match.end()
+        self._literals.append(text[pos:])
+
+    @property
+    def placeholders(self) -> Tuple[str, ...]:
+        return tuple(self._names)
+
+    def render(self, **values: str) -> str:
+        """Substitute placeholders in a single pass; values are never re-scanned for placeholders.
+
+        Placeholders without a value are left untouched.
+        """
+        parts = [self._literals[0]]
+        for name, literal in zip(self._names, self._literals[1:]):
+            value = values.get(name)
+            parts.append("{" + name + "}" if value is None else value)
+            parts.append(literal)
+        return "".join(parts)
+
+class _Entry:
+    __slots__ = ("template", "signature", "checked_at")
+
+    def __init__(self, template: PromptTemplate, signature: Tuple[int, int], checked_at: float):
+        self.template = template
+        self.signature = signature
+        self.checked_at = checked_at
+
+class TemplateRegistry:
+    """Load prompt templates once and reload them only when the file on disk changes.
+
+    The file is stat-ed at most once per ``check_interval`` seconds, so the hot path is a dict lookup.
+    """
+
+    def __init__(self, check_interval: float = 1.0):
+        self.check_interval = check_interval
+        self._entries: Dict[str, _Entry] = {}
+
+    def get(self, path: str) -> PromptTemplate:
+        now = time.monotonic()
+        entry = self._entries.get(path)
+        if entry is not None and now - entry.checked_at < self.check_interval:
+            return entry.template
+
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if entry is not None and entry.signature == signature:
+            entry.checked_at = now
+            return entry.template
+
+        with open(path, 'r') as f:
+            template = PromptTemplate(f.read())
+        self._entries[path] = _Entry(template, signature, now)
+        return template
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+def template_path_for(category: Optional[str], default_path: str, category_paths: Dict[str, str]) -> str:
+    """Pick the template configured for ``category`` (case-insensitive), falling back to the default."""
+    if category and category_paths:
+        wanted = " ".join(category.split()).casefold()
+        for name, path in category_paths.items():
+            if name.casefold() == wanted:
+                return path
+    return default_path
+
+prompt_templates = TemplateRegistry(check_interval=settings.PROMPT_TEMPLATE_CHECK_INTERVAL)
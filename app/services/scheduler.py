@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import math
+from collections import OrderedDict, defaultdict, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted; carries the HTTP status and Retry-After hint."""
+
+    def __init__(self, detail: str, status_code: int, retry_after: int):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+class FairScheduler:
+    """Admission control in front of the model backend.
+
+    At most ``max_concurrency`` generations run at once. Further requests wait in a queue bounded
+    by ``max_queue`` and are dispatched round-robin across users. Each user may hold at most
+    ``per_user_limit`` running or queued requests. Requests that do not fit are rejected right away
+    instead of timing out in the queue.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, per_user_limit: int, retry_after: int):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.per_user_limit = per_user_limit
+        self.retry_after = retry_after
+        self._running = 0
+        self._queued = 0
+        self._per_user: Dict[str, int] = defaultdict(int)
+        self._waiters: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    def admit(self, user_id: Optional[str]) -> None:
+        """Raise ``AdmissionRejected`` if a request from ``user_id`` would not be accepted right now."""
+        user = user_id or ""
+        if self.per_user_limit > 0 and self._per_user[user] >= self.per_user_limit:
+            raise AdmissionRejected(
+                "Too many concurrent requests for this user", 429, self._retry_after()
+            )
+        if self._running >= max(1, self.max_concurrency) and self._queued >= self.max_queue:
+            raise AdmissionRejected("Server is busy, please retry later", 503, self._retry_after())
+
+    async def acquire(self, user_id: Optional[str], reserved: bool = False) -> None:
+        """Wait for a model slot; ``reserved`` calls run under a ``reservation`` already charged to the user."""
+        user = user_id or ""
+        if not reserved:
+            self.admit(user_id)
+            self._per_user[user] += 1
+        if self._running < max(1, self.max_concurrency) and not self._queued:
+            self._running += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(user, deque()).append(waiter)
+        self._queued += 1
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted just before cancellation; hand it on
+                self._release_slot()
+            else:
+                self._remove_waiter(user, waiter)
+            if not reserved:
+                self._release_user(user)
+            raise
+
+    def release(self, user_id: Optional[str], reserved: bool = False) -> None:
+        if not reserved:
+            self._release_user(user_id or "")
+        self._release_slot()
+
+    @asynccontextmanager
+    async def slot(self, user_id: Optional[str], reserved: bool = False):
+        await self.acquire(user_id, reserved)
+        try:
+            yield
+        finally:
+            self.release(user_id, reserved)
+
+    @asynccontextmanager
+    async def reservation(self, user_id: Optional[str]):
+        """Admit one request from ``user_id`` that will make several model calls.
+
+        The request counts once against the per-user limit for its whole duration, without holding
+        a model slot; its calls then take slots with ``reserved=True``.
+        """
+        self.admit(user_id)
+        user = user_id or ""
+        self._per_user[user] += 1
+        try:
+            yield
+        finally:
+            self._release_user(user)
+
+    def _retry_after(self) -> int:
+        backlog = (self._queued + 1) / max(1, self.max_concurrency)
+        return self.retry_after * max(1, math.ceil(backlog))
+
+    def _release_user(self, user: str) -> None:
+        self._per_user[user] -= 1
+        if self._per_user[user] <= 0:
+            del self._per_user[user]
+
+    def _release_slot(self) -> None:
+        self._running -= 1
+        self._dispatch()
+
+    def _remove_waiter(self, user: str, waiter: asyncio.Future) -> None:
+        queue = self._waiters.get(user)
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        self._queued -= 1
+        if not queue:
+            del self._waiters[user]
+
+    def _dispatch(self) -> None:
+        while self._running < max(1, self.max_concurrency) and self._waiters:
+            user, queue = next(iter(self._waiters.items()))
+            waiter = queue.popleft()
+            self._queued -= 1
+            if queue:
+                # Round-robin: this user goes to the back of the line
+                self._waiters.move_to_end(user)
+            else:
+                del self._waiters[user]
+            if waiter.done():
+                continue
+            self._running += 1
+            waiter.set_result(None)
+
+plan_scheduler = FairScheduler(
+    max_concurrency=settings.OLLAMA_MAX_CONCURRENCY,
+    max_queue=settings.SCHEDULER_MAX_QUEUE,
+    per_user_limit=settings.SCHEDULER_PER_USER_LIMIT,
+    retry_after=settings.SCHEDULER_RETRY_AFTER_SECONDS,
+)
+
+metrics.MODEL_IN_FLIGHT.set_function(lambda: plan_scheduler.running)
+metrics.MODEL_QUEUED.set_function(lambda: plan_scheduler.queued)
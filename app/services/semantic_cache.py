@@ -0,0 +1,96 @@
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.ollama_pool import get_backend_pool
+
+logger = logging.getLogger(__name__)
+
+# An embedder maps a batch of texts to a (len(texts), dim) array
+Embedder = Callable[[Sequence[str]], Awaitable[np.ndarray]]
+
+def semantic_cache_text(category: str, job_description: str, timeline: str) -> str:
+    """Canonical text embedded for near-duplicate lookups."""
+    return "\n".join(" ".join(value.split()).casefold() for value in (category, timeline, job_description))
+
+def semantic_cache_scope(category: str, timeline: str, model: str, template_digest: str) -> str:
+    """Scope within which plans may be reused: a plan is never served for another category or timeline."""
+    return "\0".join([" ".join(category.split()).casefold(), " ".join(timeline.split()).casefold(), model, template_digest])
+
+def _scope_digest(scope: str) -> int:
+    """Fixed-width id of a scope, stored per slot so scopes need no bookkeeping once overwritten."""
+    return int.from_bytes(hashlib.blake2b(scope.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
+
+async def ollama_embedder(texts: Sequence[str]) -> np.ndarray:
+    """Embed texts with the local Ollama embedding model."""
+    async with get_backend_pool().lease() as backend:
+        response = await backend.client.embed(model=settings.SEMANTIC_CACHE_EMBED_MODEL, input=list(texts))
+    return np.asarray(response["embeddings"], dtype=np.float32)
+
+class SemanticPlanCache:
+    """Near-duplicate plan lookup over normalized embeddings held in one NumPy matrix.
+
+    Rows are unit vectors, so cosine similarity for a batch of queries is a single matrix product.
+    Entries only match within the same scope (category, timeline, model and prompt template), kept
+    as a 64-bit digest per row so memory stays bounded by the capacity. When full, the oldest entry
+    is overwritten.
+    """
+
+    def __init__(self, embedder: Embedder, threshold: float = 0.95, capacity: int = 2048):
+        self.embedder = embedder
+        self.threshold = threshold
+        self.capacity = capacity
+        self.clear()
+
+    def clear(self) -> None:
+        self._vectors: Optional[np.ndarray] = None
+        self._scopes = np.zeros(self.capacity, dtype=np.int64)
+        self._plans: List[Optional[Dict[str, Any]]] = [None] * self.capacity
+        self._size = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.asarray(await self.embedder(texts), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def match(self, vectors: np.ndarray, scope: str) -> List[Optional[Dict[str, Any]]]:
+        """Return the stored plan closest to each query vector, or None below the threshold."""
+        if self._size == 0 or vectors.shape[1] != self._vectors.shape[1]:
+            return [None] * len(vectors)
+        in_scope = self._scopes[:self._size] == _scope_digest(scope)
+        if not in_scope.any():
+            return [None] * len(vectors)
+        similarities = vectors @ self._vectors[:self._size].T
+        similarities[:, ~in_scope] = -1.0
+        best = similarities.argmax(axis=1)
+        return [
+            self._plans[index] if similarities[row, index] >= self.threshold else None
+            for row, index in enumerate(best)
+        ]
+
+    def add(self, vector: np.ndarray, scope: str, plan: Dict[str, Any]) -> None:
+        if self.capacity <= 0:
+            return
+        if self._vectors is None or self._vectors.shape[1] != vector.shape[-1]:
+            # First entry (or a different embedding model) fixes the dimension
+            self.clear()
+            self._vectors = np.zeros((self.capacity, vector.shape[-1]), dtype=np.float32)
+        slot = self._next
+        self._vectors[slot] = vector
+        self._scopes[slot] = _scope_digest(scope)
+        self._plans[slot] = plan
+        self._next = (slot + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+semantic_cache = SemanticPlanCache(
+    embedder=ollama_embedder,
+    threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+    capacity=settings.SEMANTIC_CACHE_CAPACITY,
+)
@@ -0,0 +1,121 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from app.core.config import settings
+
+_SUMMARY_COLUMNS = "seq, id, user_id, input_hash, category, timeline, job_description, etag, created_at, updated_at"
+_COLUMNS = _SUMMARY_COLUMNS + ", plan"
+
+def user_plan_id(user_id: str, input_hash: str) -> str:
+    """Stable plan id, so regenerating the same inputs for a user updates one record."""
+    return hashlib.sha256(f"{user_id}\0{input_hash}".encode("utf-8")).hexdigest()[:32]
+
+def plan_etag(plan_json: bytes, updated_at: float) -> str:
+    """Strong ETag of a stored plan record; it changes whenever the plan is saved again."""
+    return '"' + hashlib.sha256(plan_json + repr(updated_at).encode("ascii")).hexdigest()[:32] + '"'
+
+class UserPlanStore:
+    """SQLite-backed history of the plans generated for each user, keyed by user_id and input hash.
+
+    Plans are listed newest first with an opaque cursor (the row sequence number), so a page is a
+    single index range scan regardless of how many plans a user has. Plans are kept as the JSON
+    text they are served as (``plan_json``); list pages leave it out.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS user_plans ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, user_id TEXT NOT NULL, "
+                "input_hash TEXT NOT NULL, category TEXT NOT NULL, timeline TEXT NOT NULL, job_description TEXT NOT NULL, "
+                "plan TEXT NOT NULL, etag TEXT NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+                "UNIQUE (user_id, input_hash))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS user_plans_user ON user_plans (user_id, seq)")
+            self._db.commit()
+        return self._db
+
+    async def find(self, user_id: str, input_hash: str) -> Optional[Dict[str, Any]]:
+        """The stored plan for these inputs, if this user generated it before."""
+        return await asyncio.to_thread(self._select_one, "user_id = ? AND input_hash = ?", (user_id, input_hash))
+
+    async def get(self, user_id: str, plan_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._select_one, "user_id = ? AND id = ?", (user_id, plan_id))
+
+    async def save(self, user_id: str, input_hash: str, category: str, timeline: str,
+                   job_description: str, plan: dict) -> Dict[str, Any]:
+        """Insert or replace the plan stored for (user_id, input_hash) and return the record."""
+        return await asyncio.to_thread(self._upsert, user_id, input_hash, category, timeline, job_description, plan)
+
+    async def list(self, user_id: str, limit: int, cursor: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """One page of the user's plans, newest first, and the cursor of the next page (None on the last)."""
+        return await asyncio.to_thread(self._select_page, user_id, limit, cursor)
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _upsert(self, user_id: str, input_hash: str, category: str, timeline: str,
+                job_description: str, plan: dict) -> Dict[str, Any]:
+        plan_json = orjson.dumps(plan)
+        plan_id = user_plan_id(user_id, input_hash)
+        now = time.time()
+        with self._lock:
+            db = self._connect()
+            db.execute(
+                "INSERT INTO user_plans (id, user_id, input_hash, category, timeline, job_description, plan, etag, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (user_id, input_hash) DO UPDATE SET plan = excluded.plan, etag = excluded.etag, "
+                "updated_at = excluded.updated_at",
+                (plan_id, user_id, input_hash, category, timeline, job_description,
+                 plan_json.decode("utf-8"), plan_etag(plan_json, now), now, now),
+            )
+            db.commit()
+            row = db.execute(f"SELECT {_COLUMNS} FROM user_plans WHERE id = ?", (plan_id,)).fetchone()
+        return self._record(row)
+
+    def _select_one(self, where: str, params: tuple) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connect().execute(f"SELECT {_COLUMNS} FROM user_plans WHERE {where}", params).fetchone()
+        return self._record(row) if row is not None else None
+
+    def _select_page(self, user_id: str, limit: int, cursor: Optional[int]) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        # Fetch one extra row to learn whether another page follows
+        with self._lock:
+            if cursor is None:
+                rows = self._connect().execute(
+                    f"SELECT {_SUMMARY_COLUMNS} FROM user_plans WHERE user_id = ? ORDER BY seq DESC LIMIT ?", (user_id, limit + 1)
+                ).fetchall()
+            else:
+                rows = self._connect().execute(
+                    f"SELECT {_SUMMARY_COLUMNS} FROM user_plans WHERE user_id = ? AND seq < ? ORDER BY seq DESC LIMIT ?",
+                    (user_id, cursor, limit + 1),
+                ).fetchall()
+        records = [self._record(row) for row in rows[:limit]]
+        next_cursor = records[-1]["seq"] if len(rows) > limit else None
+        return records, next_cursor
+
+    @staticmethod
+    def _record(row: tuple) -> Dict[str, Any]:
+        record = {
+            "seq": row[0], "id": row[1], "user_id": row[2], "input_hash": row[3], "category": row[4],
+            "timeline": row[5], "job_description": row[6], "etag": row[7], "created_at": row[8], "updated_at": row[9],
+        }
+        if len(row) > 10:
+            record["plan_json"] = row[10]
+        return record
+
+user_plans = UserPlanStore(settings.USER_PLANS_DB_PATH)
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from typing import Optional
+
+from app.core.config import settings
+from app.services.ollama_pool import Backend, BackendPool, model_request_options
+
+logger = logging.getLogger(__name__)
+
+class ModelWarmup:
+    """Pre-load the model and track whether the instance is ready for traffic.
+
+    The instance becomes ready once the model has been loaded on at least one backend, and stays
+    ready: Ollama unloading an idle model (``OLLAMA_KEEP_ALIVE``) only costs the next request a
+    reload, so it must not take every replica out of the load balancer at once. Warm-up is retried
+    with exponential backoff until it succeeds, e.g. when Ollama comes up after the API. With
+    ``WARMUP_KEEP_LOADED``, backends the periodic health check finds without the model are warmed
+    again in the background.
+    """
+
+    def __init__(self):
+        self._pool: Optional[BackendPool] = None
+        self._disabled = False
+        self._warmed = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._disabled or self._warmed
+
+    async def warm_backend(self, backend: Backend, timeout: float) -> bool:
+        try:
+            # An empty prompt loads the model into memory without generating anything
+            await asyncio.wait_for(
+                backend.client.generate(model=settings.OLLAMA_MODEL, prompt="", **model_request_options()),
+                timeout,
+            )
+        except Exception as e:
+            logger.warning(f"Warm-up of '{settings.OLLAMA_MODEL}' on '{backend.name}' failed: {str(e)}")
+            backend.warm = False
+            return False
+        backend.warm = True
+        logger.info(f"Model '{settings.OLLAMA_MODEL}' is loaded on '{backend.name}'")
+        return True
+
+    async def warm(self, pool: BackendPool) -> bool:
+        """Load the model on every cold backend; returns whether at least one backend is warm."""
+        self._pool = pool
+        await asyncio.gather(*(
+            self.warm_backend(backend, settings.WARMUP_TIMEOUT_SECONDS)
+            for backend in pool.backends if not backend.warm
+        ))
+        loaded = any(backend.warm for backend in pool.backends)
+        self._warmed = self._warmed or loaded
+        return loaded
+
+    def _needs_warming(self, pool: BackendPool) -> bool:
+        if self._warmed and not settings.WARMUP_KEEP_LOADED:
+            return False
+        return any(not backend.warm for backend in pool.backends)
+
+    async def keep_warm(self, pool: BackendPool) -> None:
+        """Warm up, retrying with backoff, then keep cold backends warm while WARMUP_KEEP_LOADED is set."""
+        self._pool = pool
+        delay = settings.WARMUP_RETRY_INITIAL_SECONDS
+        while True:
+            if self._warmed and not settings.WARMUP_KEEP_LOADED:
+                return
+            if self._needs_warming(pool):
+                await self.warm(pool)
+                if self._needs_warming(pool):
+                    cold = sum(not backend.warm for backend in pool.backends)
+                    logger.warning(f"'{settings.OLLAMA_MODEL}' is not loaded on {cold} backend(s); retrying warm-up in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, settings.WARMUP_RETRY_MAX_SECONDS)
+                    continue
+                delay = settings.WARMUP_RETRY_INITIAL_SECONDS
+            await asyncio.sleep(settings.WARMUP_RETRY_INITIAL_SECONDS)
+
+    def start(self, pool: BackendPool) -> None:
+        """Warm up in the background so the process can answer liveness probes meanwhile."""
+        self._pool = pool
+        self._disabled = not settings.WARMUP_ENABLED
+        if not self._disabled:
+            self._task = asyncio.create_task(self.keep_warm(pool))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._pool = None
+        self._disabled = False
+        self._warmed = False
+
+model_warmup = ModelWarmup()
@@ -0,0 +1,48 @@
+"""Measure job description preprocessing: token reduction and cost per posting.
+
+Runs the preprocessor over the sample postings in ``tests/data/job_descriptions`` and reports the
+estimated tokens before and after, and the mean time per posting.
+
+    python -m benchmarks.bench_jd_preprocess [--iterations 2000] [--max-tokens 1500] [--output bench_jd.json]
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+from app.services.jd_preprocess import estimate_tokens, preprocess_job_description
+
+CORPUS_DIR = Path(__file__).resolve().parent.parent / "tests" / "data" / "job_descriptions"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--max-tokens", type=int, default=1500)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    postings = {}
+    for path in sorted(CORPUS_DIR.iterdir()):
+        raw = path.read_text()
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            processed = preprocess_job_description(raw, args.max_tokens)
+        postings[path.name] = {
+            "raw_chars": len(raw),
+            "processed_chars": len(processed),
+            "raw_tokens": estimate_tokens(raw),
+            "processed_tokens": estimate_tokens(processed),
+            "mean_us_per_posting": (time.perf_counter() - start) / args.iterations * 1e6,
+        }
+    raw_tokens = sum(result["raw_tokens"] for result in postings.values())
+    processed_tokens = sum(result["processed_tokens"] for result in postings.values())
+    results = {
+        "postings": postings,
+        "token_reduction": 1 - processed_tokens / raw_tokens if raw_tokens else 0.0,
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
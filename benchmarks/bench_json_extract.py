@@ -0,0 +1,75 @@
+"""Compare the legacy fence-splitting parser with the single-pass extractor.
+
+Runs both over the recorded model outputs in ``tests/data/model_outputs`` and reports how many
+completions each one turns into a schema-valid plan (a result that fails ``CareerPlan`` validation
+would still fail the request, so it counts as failed), the mean cost per parse over the whole corpus, and the mean cost
+over the completions the legacy parser also handles (the like-for-like comparison).
+
+    python -m benchmarks.bench_json_extract [--iterations 2000] [--output bench_json.json]
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from app.schemas.plan import CareerPlan
+from app.services.json_extract import parse_model_json
+
+CORPUS_DIR = Path(__file__).resolve().parent.parent / "tests" / "data" / "model_outputs"
+
+def legacy_parse(content: str):
+    """The fence-splitting parser used before the single-pass extractor."""
+    if "```json" in content:
+        content = content.split("```json")[1].split("```")[0].strip()
+    elif "```" in content:
+        content = content.split("```")[1].split("```")[0].strip()
+    return json.loads(content)
+
+def parses(parse, text):
+    try:
+        CareerPlan.model_validate(parse(text))
+        return True
+    except (ValueError, ValidationError):
+        return False
+
+def mean_us(parse, texts, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for text in texts:
+            try:
+                parse(text)
+            except ValueError:
+                pass
+    return (time.perf_counter() - start) / (iterations * len(texts)) * 1e6
+
+def measure(parse, texts, common, iterations):
+    parsed = sum(parses(parse, text) for text in texts)
+    return {
+        "parsed": parsed,
+        "failed": len(texts) - parsed,
+        "mean_us_per_parse": mean_us(parse, texts, iterations),
+        "mean_us_per_parse_common": mean_us(parse, common, iterations) if common else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    texts = [path.read_text() for path in sorted(CORPUS_DIR.glob("*.txt"))]
+    common = [text for text in texts if parses(legacy_parse, text)]
+    results = {
+        "corpus_size": len(texts),
+        "common_size": len(common),
+        "legacy": measure(legacy_parse, texts, common, args.iterations),
+        "single_pass": measure(parse_model_json, texts, common, args.iterations),
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""A fake Ollama server for load tests.
+
+Serves ``/api/chat`` (blocking and streaming), ``/api/generate`` (the model load used by the warm-up),
+``/api/ps``, ``/api/tags`` and ``/api/embed`` with a configurable time to first token, token rate and share of malformed completions, so the service
+can be benchmarked without a GPU.
+
+    python -m benchmarks.fake_ollama --port 11500 --latency 0.5 --token-rate 200 --tokens 600
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+@dataclass
+class FakeOllamaConfig:
+    latency: float = 0.5
+    token_rate: float = 200.0
+    tokens: int = 600
+    malformed_rate: float = 0.0
+    seed: int = 0
+
+def build_plan(tokens: int) -> str:
+    """A schema-valid plan whose JSON is roughly ``tokens`` tokens (about 4 characters each) long."""
+    topics = []
+    plan = {"skills": [{"skill_name": "Kotlin", "total_days": 7, "topics": topics}]}
+    while len(json.dumps(plan)) < tokens * 4:
+        index = len(topics)
+        topics.append({
+            "topic_name": f"Topic {index}",
+            "study_material": f"https://example.com/kotlin/topic-{index}",
+            "timeline": "1 day",
+            "priority": ("High", "Medium", "Low")[index % 3],
+            "bonus": index % 5 == 4,
+        })
+    return json.dumps(plan)
+
+def malform(content: str, rng: random.Random) -> str:
+    kind = rng.choice(("truncated", "prose", "fence", "garbage"))
+    if kind == "truncated":
+        return content[:int(len(content) * 0.8)]
+    if kind == "prose":
+        return "Here is your plan:\n" + content + "\nGood luck!"
+    if kind == "fence":
+        return "```json\n" + content + "\n```"
+    return "I'm sorry, I can't produce a plan for that description."
+
+def create_app(config: FakeOllamaConfig) -> FastAPI:
+    app = FastAPI(title="Fake Ollama")
+    rng = random.Random(config.seed)
+    plan = build_plan(config.tokens)
+    # Models "loaded" by a generate or chat call, as reported by /api/ps
+    loaded = set()
+
+    def completion() -> str:
+        if config.malformed_rate and rng.random() < config.malformed_rate:
+            return malform(plan, rng)
+        return plan
+
+    def stats(start: float, content: str) -> dict:
+        elapsed_ns = int((time.perf_counter() - start) * 1e9)
+        eval_count = max(1, len(content) // 4)
+        return {
+            "done": True,
+            "done_reason": "stop",
+            "total_duration": elapsed_ns,
+            "load_duration": 0,
+            "prompt_eval_count": 200,
+            "prompt_eval_duration": int(config.latency * 1e9),
+            "eval_count": eval_count,
+            "eval_duration": max(0, elapsed_ns - int(config.latency * 1e9)),
+        }
+
+    @app.post("/api/chat")
+    async def chat(request: Request):
+        body = await request.json()
+        model = body.get("model", "fake")
+        loaded.add(model)
+        content = completion()
+        start = time.perf_counter()
+
+        if not body.get("stream", True):
+            await asyncio.sleep(config.latency + len(content) / 4 / config.token_rate)
+            return JSONResponse({
+                "model": model,
+                "created_at": "2024-01-01T00:00:00Z",
+                "message": {"role": "assistant", "content": content},
+                **stats(start, content),
+            })
+
+        async def chunks():
+            await asyncio.sleep(config.latency)
+            # Emit tokens in ~20 ms ticks so high token rates do not mean thousands of sleeps
+            per_tick = max(1, int(config.token_rate * 0.02))
+            step = per_tick * 4
+            for offset in range(0, len(content), step):
+                piece = content[offset:offset + step]
+                yield json.dumps({"model": model, "message": {"role": "assistant", "content": piece}, "done": False}) + "\n"
+                await asyncio.sleep(per_tick / config.token_rate)
+            yield json.dumps({"model": model, "message": {"role": "assistant", "content": ""}, **stats(start, content)}) + "\n"
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        body = await request.json()
+        model = body.get("model", "fake")
+        # Only the empty-prompt model load is needed by the service
+        if model not in loaded:
+            await asyncio.sleep(config.latency)
+            loaded.add(model)
+        return {"model": model, "created_at": "2024-01-01T00:00:00Z", "response": "", "done": True, "done_reason": "load"}
+
+    @app.post("/api/embed")
+    async def embed(request: Request):
+        body = await request.json()
+        inputs = body.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        embeddings = []
+        for text in inputs:
+            digest = hashlib.sha256(text.encode()).digest()
+            embeddings.append([byte / 255.0 for byte in digest])
+        return {"model": body.get("model", "fake"), "embeddings": embeddings}
+
+    @app.get("/api/ps")
+    async def ps():
+        return {"models": [{"name": model, "model": model} for model in sorted(loaded)]}
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": []}
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Ollama server for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds before the first token")
+    parser.add_argument("--token-rate", type=float, default=200.0, help="Generated tokens per second")
+    parser.add_argument("--tokens", type=int, default=600, help="Approximate tokens per completion")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Share of malformed completions (0-1)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import uvicorn
+    config = FakeOllamaConfig(args.latency, args.token_rate, args.tokens, args.malformed_rate, args.seed)
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Drive ``/career-plan`` at controlled concurrency against a fake Ollama server.
+
+Starts ``benchmarks.fake_ollama`` and the API (``app.main:app`` under uvicorn) as subprocesses,
+fires requests at each concurrency level while probing ``/metrics`` to expose event-loop stalls, and
+writes throughput, latency percentiles and server CPU per request to a JSON file so runs can be
+compared commit to commit.
+
+    python -m benchmarks.load_test --concurrency 1 8 32 --requests 200 --output bench_results.json
+
+Pass ``--target http://host:port`` to benchmark an already running server instead.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def process_cpu_seconds(pid: int) -> Optional[float]:
+    """User + system CPU time of a process, read from /proc (Linux only)."""
+    try:
+        fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    ticks = os.sysconf("SC_CLK_TCK")
+    return (int(fields[11]) + int(fields[12])) / ticks
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def wait_until_up(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+def start_fake_ollama(args) -> Tuple[subprocess.Popen, str]:
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_ollama", "--port", str(port),
+         "--latency", str(args.latency), "--token-rate", str(args.token_rate),
+         "--tokens", str(args.tokens), "--malformed-rate", str(args.malformed_rate)],
+        cwd=ROOT,
+    )
+    url = f"http://127.0.0.1:{port}"
+    wait_until_up(f"{url}/api/ps")
+    return process, url
+
+def start_api(args, ollama_url: str, workdir: str) -> Tuple[subprocess.Popen, str]:
+    port = free_port()
+    env = dict(
+        os.environ,
+        OLLAMA_HOSTS=json.dumps([ollama_url]),
+        OLLAMA_MAX_CONCURRENCY=str(args.model_concurrency),
+        PLAN_CACHE_ENABLED="false",
+        SCHEDULER_PER_USER_LIMIT="0",
+        SCHEDULER_MAX_QUEUE="100000",
+        JOBS_DB_PATH=os.path.join(workdir, "jobs.db"),
+        # Like the plan cache, per-user history would answer repeat requests without the model
+        USER_PLANS_ENABLED="false",
+        USER_PLANS_DB_PATH=os.path.join(workdir, "plans.db"),
+        LOG_LEVEL="WARNING",
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    wait_until_up(f"{url}/openapi.json")
+    return process, url
+
+async def probe_loop(client: httpx.AsyncClient, url: str, stop: asyncio.Event, samples: List[float]) -> None:
+    """Time a cheap endpoint while under load; slow probes mean the event loop is blocked."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            await client.get(f"{url}/metrics")
+            samples.append(time.perf_counter() - start)
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.05)
+
+async def run_level(url: str, concurrency: int, total: int, endpoint: str, server_pid: Optional[int]) -> dict:
+    latencies: List[float] = []
+    statuses: dict = {}
+    probes: List[float] = []
+    counter = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency + 2)
+
+    async with httpx.AsyncClient(timeout=600.0, limits=limits) as client:
+        async def worker() -> None:
+            for index in counter:
+                payload = {
+                    "user_id": f"bench-{index % 97}",
+                    "category": "Android",
+                    "timeline": "1 week",
+                    # Unique descriptions so caches and request coalescing do not hide model cost
+                    "job_description": f"Android developer with Kotlin and MVVM, opening {index} {time.time_ns()}",
+                }
+                start = time.perf_counter()
+                try:
+                    response = await client.post(f"{url}{endpoint}", json=payload)
+                    await response.aread()
+                    key = str(response.status_code)
+                except httpx.HTTPError as e:
+                    key = type(e).__name__
+                latencies.append(time.perf_counter() - start)
+                statuses[key] = statuses.get(key, 0) + 1
+
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe_loop(client, url, stop, probes))
+        cpu_before = process_cpu_seconds(server_pid) if server_pid else None
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        cpu_after = process_cpu_seconds(server_pid) if server_pid else None
+        stop.set()
+        await prober
+
+    cpu_per_request = None
+    if cpu_before is not None and cpu_after is not None:
+        cpu_per_request = (cpu_after - cpu_before) / total * 1000
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "elapsed_s": elapsed,
+        "throughput_rps": total / elapsed,
+        "latency_s": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies) if latencies else None,
+        },
+        "status_counts": statuses,
+        "server_cpu_ms_per_request": cpu_per_request,
+        "loop_probe_s": {"p50": percentile(probes, 50), "p99": percentile(probes, 99), "samples": len(probes)},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test /career-plan against a fake Ollama server")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=100, help="Requests per concurrency level")
+    parser.add_argument("--endpoint", default="/career-plan", choices=["/career-plan", "/career-plan/stream"])
+    parser.add_argument("--target", help="Benchmark this running server instead of starting one")
+    parser.add_argument("--model-concurrency", type=int, default=32, help="OLLAMA_MAX_CONCURRENCY for the API")
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--token-rate", type=float, default=2000.0)
+    parser.add_argument("--tokens", type=int, default=600)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args()
+
+    processes = []
+    workdir = tempfile.mkdtemp(prefix="kairos-bench-")
+    try:
+        if args.target:
+            url, server_pid = args.target.rstrip("/"), None
+        else:
+            fake, ollama_url = start_fake_ollama(args)
+            processes.append(fake)
+            api, url = start_api(args, ollama_url, workdir)
+            processes.append(api)
+            server_pid = api.pid
+
+        levels = []
+        for concurrency in args.concurrency:
+            result = asyncio.run(run_level(url, concurrency, args.requests, args.endpoint, server_pid))
+            levels.append(result)
+            print(
+                f"c={concurrency:<4} {result['throughput_rps']:8.1f} req/s  "
+                f"p50={result['latency_s']['p50']:.3f}s p95={result['latency_s']['p95']:.3f}s "
+                f"p99={result['latency_s']['p99']:.3f}s  statuses={result['status_counts']}"
+            )
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            process.wait(timeout=10)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": vars(args),
+        "levels": levels,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"Wrote {args.output}")
+
+if __name__ == "__main__":
+    main()
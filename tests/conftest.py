@@ -1,11 +1,38 @@
 import pytest
 from fastapi.testclient import TestClient
+from unittest.mock import patch
 from app.main import app
 from app.core.config import settings
+from app.services.plan_cache import plan_cache
+from app.services.plan_jobs import plan_jobs
+from app.services.prompt_template import prompt_templates
+from app.services.semantic_cache import semantic_cache
+from app.services.user_plans import user_plans
 import tempfile
 import os
 
 
+@pytest.fixture(autouse=True)
+def reset_service_state(tmp_path):
+    """Start every test with empty plan caches, empty user plan and job stores and no loaded prompt templates.
+
+    The stores live in ``tmp_path`` so tests that run the app lifespan never write to the working directory.
+    """
+    plan_cache.clear()
+    semantic_cache.clear()
+    prompt_templates.clear()
+    user_plans.close()
+    plan_jobs.store.close()
+    with patch.object(user_plans, 'db_path', str(tmp_path / "user_plans.db")), \
+            patch.object(plan_jobs.store, 'db_path', str(tmp_path / "jobs.db")):
+        yield
+        user_plans.close()
+        plan_jobs.store.close()
+    plan_cache.clear()
+    semantic_cache.clear()
+    prompt_templates.clear()
+
+
 @pytest.fixture
 def client():
     """Create a test client for the FastAPI app."""
@@ -1,5 +1,6 @@
+import asyncio
 import pytest
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 from fastapi.responses import JSONResponse
 import json
 
@@ -11,7 +12,7 @@ class TestCareerEndpoint:
     def test_career_plan_endpoint_success(self, client, sample_job_request, mock_ollama_response, temp_prompt_file):
         """Test successful career plan request."""
         with patch('app.core.config.settings.PROMPT_TEMPLATE_PATH', temp_prompt_file):
-            with patch('app.services.career_service.ollama.chat', return_value=mock_ollama_response):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response):
                 response = client.post("/career-plan", json=sample_job_request)
                 
                 assert response.status_code == 200
@@ -57,7 +58,7 @@ class TestCareerEndpoint:
         }
         
         with patch('app.core.config.settings.PROMPT_TEMPLATE_PATH', temp_prompt_file):
-            with patch('app.services.career_service.ollama.chat', return_value=mock_ollama_response):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response):
                 response = client.post("/career-plan", json=empty_request)
                 # Should still process, even with empty strings
                 assert response.status_code in [200, 500]
@@ -66,8 +67,137 @@ class TestCareerEndpoint:
     def test_career_plan_endpoint_service_error(self, client, sample_job_request, temp_prompt_file):
         """Test career plan endpoint when service raises an error."""
         with patch('app.core.config.settings.PROMPT_TEMPLATE_PATH', temp_prompt_file):
-            with patch('app.services.career_service.ollama.chat', side_effect=Exception("Service unavailable")):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, side_effect=Exception("Service unavailable")):
                 response = client.post("/career-plan", json=sample_job_request)
                 
                 assert response.status_code == 500
                 assert "detail" in response.json()
+
+
+class TestCareerStreamEndpoint:
+    """Test cases for /career-plan/stream endpoint."""
+
+    @staticmethod
+    def _stream_of(content, size=5):
+        async def chunks():
+            for i in range(0, len(content), size):
+                yield {"message": {"content": content[i:i + size]}}
+        return chunks()
+
+    @pytest.mark.unit
+    def test_stream_endpoint_emits_ndjson_events(self, client, sample_job_request, mock_ollama_response, temp_prompt_file):
+        """Test that skills, topics and the full plan arrive as NDJSON lines."""
+        content = mock_ollama_response["message"]["content"]
+        with patch('app.core.config.settings.PROMPT_TEMPLATE_PATH', temp_prompt_file):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=self._stream_of(content)):
+                response = client.post("/career-plan/stream", json=sample_job_request)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert [event["event"] for event in events] == ["topic", "skill", "plan"]
+        assert events[1]["data"]["skill_name"] == "Python"
+        assert events[2]["data"]["skills"][0]["topics"][0]["topic_name"] == "FastAPI"
+
+    @pytest.mark.unit
+    def test_stream_endpoint_reports_parse_failure(self, client, sample_job_request, temp_prompt_file):
+        """Test that an unparseable completion ends the stream with an error event."""
+        with patch('app.core.config.settings.PROMPT_TEMPLATE_PATH', temp_prompt_file):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=self._stream_of("no json here")):
+                response = client.post("/career-plan/stream", json=sample_job_request)
+
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert events == [{"event": "error", "detail": "Failed to parse JSON from model response"}]
+
+
+class TestBatchEndpoint:
+    """Test cases for /career-plans/batch endpoint."""
+
+    @staticmethod
+    def _item(user, description):
+        return {"user_id": user, "category": "Software Engineering", "timeline": "1 week", "job_description": description}
+
+    @pytest.mark.unit
+    def test_batch_dedupes_identical_inputs(self, client, mock_ollama_response, temp_prompt_file):
+        """Test that identical inputs from different users share one generation."""
+        batch = {"requests": [self._item(f"user_{i}", "Backend Developer") for i in range(5)]}
+        with patch('app.core.config.settings.PROMPT_TEMPLATE_PATH', temp_prompt_file):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response) as chat:
+                response = client.post("/career-plans/batch", json=batch)
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [item["index"] for item in results] == list(range(5))
+        assert all(item["status"] == "ok" and "skills" in item["plan"] for item in results)
+        assert chat.await_count == 1
+
+    @pytest.mark.unit
+    def test_batch_isolates_failed_items(self, client, mock_ollama_response, temp_prompt_file):
+        """Test that one failed generation does not fail the rest of the batch."""
+        async def chat(*args, **kwargs):
+            if "Broken" in kwargs["messages"][0]["content"]:
+                return {"message": {"content": "not json"}}
+            return mock_ollama_response
+
+        batch = {"requests": [self._item("a", "Backend Developer"), self._item("b", "Broken"), self._item("c", "Frontend Developer")]}
+        with patch('app.core.config.settings.PROMPT_TEMPLATE_PATH', temp_prompt_file):
+            with patch('ollama.AsyncClient.chat', side_effect=chat):
+                response = client.post("/career-plans/batch", json=batch)
+
+        assert response.status_code == 200
+        statuses = [(item["status"], item["status_code"]) for item in response.json()["results"]]
+        assert statuses == [("ok", 200), ("error", 500), ("ok", 200)]
+        assert "Failed to parse JSON" in response.json()["results"][1]["detail"]
+
+    @pytest.mark.unit
+    def test_batch_isolates_malformed_items(self, client, mock_ollama_response, temp_prompt_file):
+        """Test that an item failing validation is reported with 422 while the others are generated."""
+        batch = {"requests": [self._item("a", "Backend Developer"), {"user_id": "b"}, "not an object"]}
+        with patch('app.core.config.settings.PROMPT_TEMPLATE_PATH', temp_prompt_file):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response):
+                response = client.post("/career-plans/batch", json=batch)
+
+        assert response.status_code == 200
+        ok, missing_fields, not_an_object = response.json()["results"]
+        assert (ok["status"], ok["status_code"]) == ("ok", 200)
+        assert (missing_fields["status"], missing_fields["status_code"]) == ("error", 422)
+        assert "job_description: Field required" in missing_fields["detail"]
+        assert not_an_object["status_code"] == 422
+
+    @pytest.mark.unit
+    def test_batch_streams_ndjson_results(self, client, mock_ollama_response, temp_prompt_file):
+        """Test that each item's result arrives as its own NDJSON line when the client asks for it."""
+        batch = {"requests": [self._item("a", "Backend Developer"), {"user_id": "b"}, self._item("c", "Frontend Developer")]}
+        with patch('app.core.config.settings.PROMPT_TEMPLATE_PATH', temp_prompt_file):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response):
+                response = client.post("/career-plans/batch", json=batch, headers={"Accept": "application/x-ndjson"})
+
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        # Validation failures are reported before any generation finishes
+        assert lines[0]["index"] == 1 and lines[0]["status_code"] == 422
+        assert sorted((line["index"], line["status_code"]) for line in lines[1:]) == [(0, 200), (2, 200)]
+
+    @pytest.mark.unit
+    def test_batch_deadline_reports_unfinished_items(self, client, mock_ollama_response, temp_prompt_file):
+        """Test that items still generating at the deadline get 504 while finished items are kept."""
+        async def chat(*args, **kwargs):
+            if "Slow" in kwargs["messages"][0]["content"]:
+                await asyncio.sleep(10)
+            return mock_ollama_response
+
+        batch = {"requests": [self._item("a", "Backend Developer"), self._item("b", "Slow Developer")]}
+        with patch('app.core.config.settings.PROMPT_TEMPLATE_PATH', temp_prompt_file):
+            with patch('ollama.AsyncClient.chat', side_effect=chat):
+                response = client.post("/career-plans/batch", json=batch, headers={"X-Request-Timeout": "0.2"})
+
+        statuses = [(item["status"], item["status_code"]) for item in response.json()["results"]]
+        assert statuses == [("ok", 200), ("error", 504)]
+
+    @pytest.mark.unit
+    def test_batch_size_limit(self, client):
+        """Test that oversized batches are rejected up front."""
+        batch = {"requests": [self._item("a", f"Developer {i}") for i in range(3)]}
+        with patch('app.core.config.settings.BATCH_MAX_ITEMS', 2):
+            response = client.post("/career-plans/batch", json=batch)
+        assert response.status_code == 413
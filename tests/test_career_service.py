@@ -1,11 +1,13 @@
+import asyncio
 import pytest
-from unittest.mock import patch, mock_open, MagicMock
+from unittest.mock import AsyncMock, patch, mock_open, MagicMock
 from fastapi import HTTPException
-from fastapi.responses import JSONResponse
 import json
 
 from app.services.career_service import get_prompt, generate_career_plan_logic
 from app.core.config import settings
+from app.schemas.plan import CareerPlan
+from app.services.scheduler import plan_scheduler
 
 
 class TestGetPrompt:
@@ -49,13 +51,15 @@ class TestGenerateCareerPlanLogic:
     """Test cases for generate_career_plan_logic function."""
     
     @pytest.mark.unit
-    def test_generate_career_plan_success(self, temp_prompt_file, mock_ollama_response):
+    @pytest.mark.asyncio
+    async def test_generate_career_plan_success(self, temp_prompt_file, mock_ollama_response):
         """Test successful career plan generation."""
         with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file):
-            with patch('app.services.career_service.ollama.chat', return_value=mock_ollama_response):
-                result = generate_career_plan_logic("Software Engineering", "Python Developer", "2 weeks")
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response):
+                result = await generate_career_plan_logic("Software Engineering", "Python Developer", "2 weeks")
                 
-                assert isinstance(result, JSONResponse)
+                assert result.status_code == 200
+                assert result.media_type == "application/json"
                 # Parse the response body
                 response_data = json.loads(result.body.decode())
                 assert "skills" in response_data
@@ -63,7 +67,8 @@ class TestGenerateCareerPlanLogic:
                 assert response_data["skills"][0]["skill_name"] == "Python"
     
     @pytest.mark.unit
-    def test_generate_career_plan_json_decode_error(self, temp_prompt_file):
+    @pytest.mark.asyncio
+    async def test_generate_career_plan_json_decode_error(self, temp_prompt_file):
         """Test career plan generation with invalid JSON response."""
         invalid_response = {
             "message": {
@@ -72,25 +77,27 @@ class TestGenerateCareerPlanLogic:
         }
         
         with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file):
-            with patch('app.services.career_service.ollama.chat', return_value=invalid_response):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=invalid_response):
                 with pytest.raises(HTTPException) as exc_info:
-                    generate_career_plan_logic("Category", "Description", "Timeline")
+                    await generate_career_plan_logic("Category", "Description", "Timeline")
                 
                 assert exc_info.value.status_code == 500
                 assert "Failed to parse JSON" in exc_info.value.detail
     
     @pytest.mark.unit
-    def test_generate_career_plan_ollama_error(self, temp_prompt_file):
+    @pytest.mark.asyncio
+    async def test_generate_career_plan_ollama_error(self, temp_prompt_file):
         """Test career plan generation when Ollama fails."""
         with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file):
-            with patch('app.services.career_service.ollama.chat', side_effect=Exception("Ollama connection failed")):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, side_effect=Exception("Ollama connection failed")):
                 with pytest.raises(HTTPException) as exc_info:
-                    generate_career_plan_logic("Category", "Description", "Timeline")
+                    await generate_career_plan_logic("Category", "Description", "Timeline")
                 
                 assert exc_info.value.status_code == 500
     
     @pytest.mark.unit
-    def test_generate_career_plan_with_code_blocks(self, temp_prompt_file):
+    @pytest.mark.asyncio
+    async def test_generate_career_plan_with_code_blocks(self, temp_prompt_file):
         """Test career plan generation with markdown code blocks."""
         response_with_backticks = {
             "message": {
@@ -99,9 +106,127 @@ class TestGenerateCareerPlanLogic:
         }
         
         with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file):
-            with patch('app.services.career_service.ollama.chat', return_value=response_with_backticks):
-                result = generate_career_plan_logic("Category", "Description", "Timeline")
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=response_with_backticks):
+                result = await generate_career_plan_logic("Category", "Description", "Timeline")
                 
-                assert isinstance(result, JSONResponse)
+                assert result.media_type == "application/json"
                 response_data = json.loads(result.body.decode())
                 assert "skills" in response_data
+    
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_generate_career_plan_bounds_concurrency(self, temp_prompt_file, mock_ollama_response):
+        """Test that concurrent generations share the loop but respect OLLAMA_MAX_CONCURRENCY."""
+        in_flight = 0
+        peak = 0
+
+        async def slow_chat(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return mock_ollama_response
+
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch.object(plan_scheduler, 'max_concurrency', 2), \
+                patch.object(plan_scheduler, 'per_user_limit', 0):
+            with patch('ollama.AsyncClient.chat', side_effect=slow_chat):
+                results = await asyncio.gather(*[
+                    generate_career_plan_logic("Category", f"Description {i}", "Timeline")
+                    for i in range(6)
+                ])
+
+        assert all(result.status_code == 200 for result in results)
+        assert peak == 2
+
+
+class TestRequestCoalescing:
+    """Test cases for single-flight coalescing of identical requests."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("cache_enabled", [True, False])
+    async def test_identical_concurrent_requests_share_one_generation(self, temp_prompt_file, mock_ollama_response, cache_enabled):
+        """Test that N concurrent identical requests invoke the model exactly once."""
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_chat(*args, **kwargs):
+            started.set()
+            await release.wait()
+            return mock_ollama_response
+
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch.object(settings, 'PLAN_CACHE_ENABLED', cache_enabled):
+            with patch('ollama.AsyncClient.chat', side_effect=slow_chat) as chat:
+                tasks = [
+                    asyncio.create_task(generate_career_plan_logic("Android", "MVVM", "1 week"))
+                    for _ in range(10)
+                ]
+                await started.wait()
+                release.set()
+                results = await asyncio.gather(*tasks)
+
+        assert chat.call_count == 1
+        bodies = {result.body for result in results}
+        assert len(bodies) == 1
+        assert "skills" in json.loads(bodies.pop())
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_coalesced_callers_share_failure(self, temp_prompt_file):
+        """Test that a failed generation is reported to every coalesced caller."""
+        async def failing_chat(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            raise Exception("Ollama connection failed")
+
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file):
+            with patch('ollama.AsyncClient.chat', side_effect=failing_chat) as chat:
+                results = await asyncio.gather(
+                    *[generate_career_plan_logic("Android", "MVVM", "1 week") for _ in range(3)],
+                    return_exceptions=True,
+                )
+
+        assert chat.call_count == 1
+        assert all(isinstance(result, HTTPException) and result.status_code == 500 for result in results)
+
+
+class TestSchemaConstrainedGeneration:
+    """Test cases for schema-constrained generation and validation."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_plan_schema_is_sent_as_format(self, temp_prompt_file, mock_ollama_response):
+        """Test that the CareerPlan JSON Schema is passed to Ollama's format parameter."""
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response) as chat:
+                await generate_career_plan_logic("Category", "Description", "Timeline")
+
+        assert chat.await_args.kwargs["format"] == CareerPlan.model_json_schema()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_plan_is_normalized_to_schema_types(self, temp_prompt_file):
+        """Test that coercible values are returned with their schema types."""
+        content = '{"skills": [{"skill_name": "Go", "total_days": "4", "topics": [{"topic_name": "Goroutines", "study_material": "https://go.dev/tour", "timeline": "1 day", "priority": "Medium", "bonus": "true"}]}]}'
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value={"message": {"content": content}}):
+                result = await generate_career_plan_logic("Category", "Description", "Timeline")
+
+        skill = json.loads(result.body)["skills"][0]
+        assert skill["total_days"] == 4
+        assert skill["topics"][0]["bonus"] is True
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_schema_mismatch_is_reported(self, temp_prompt_file):
+        """Test that a plan missing required fields is rejected and not cached."""
+        content = '{"skills": [{"skill_name": "Go", "topics": []}]}'
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value={"message": {"content": content}}):
+                with pytest.raises(HTTPException) as exc_info:
+                    await generate_career_plan_logic("Category", "Description", "Timeline")
+
+        assert exc_info.value.status_code == 500
+        assert "schema" in exc_info.value.detail
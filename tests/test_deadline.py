@@ -0,0 +1,203 @@
+import asyncio
+import json
+
+import pytest
+from unittest.mock import patch
+
+from app.core import metrics
+from app.core.config import settings
+from app.main import app
+from app.services.batch_service import generate_career_plans_batch_logic
+from app.services.career_service import generate_career_plan_logic
+from app.services.deadline import DEADLINE, DISCONNECT, RequestCancelled, effective_timeout, run_cancellable
+from app.services.scheduler import plan_scheduler
+from app.services.single_flight import SingleFlight
+
+
+class SlowModel:
+    """A chat call that never finishes on its own and records whether it was aborted."""
+
+    def __init__(self):
+        self.calls = 0
+        self.cancelled = 0
+
+    async def chat(self, **kwargs):
+        self.calls += 1
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+
+class TestRunCancellable:
+    """Test cases for deadline enforcement and disconnect detection."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("server, client, expected", [
+        (300.0, None, 300.0), (300.0, 5.0, 5.0), (10.0, 60.0, 10.0), (0, 5.0, 5.0), (0, None, None),
+    ])
+    def test_effective_timeout(self, server, client, expected):
+        """Test that the tighter of the server and client limits wins."""
+        assert effective_timeout(server, client) == expected
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_deadline_cancels_work(self):
+        """Test that work still running at the deadline is cancelled."""
+        work = asyncio.ensure_future(asyncio.sleep(30))
+        with pytest.raises(RequestCancelled) as exc_info:
+            await run_cancellable(work, timeout=0.05)
+        assert exc_info.value.reason == DEADLINE
+        assert work.cancelled()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_disconnect_cancels_work(self):
+        """Test that a disconnect noticed while polling cancels the work."""
+        checks = []
+
+        async def is_disconnected():
+            checks.append(True)
+            return len(checks) >= 2
+
+        work = asyncio.ensure_future(asyncio.sleep(30))
+        with pytest.raises(RequestCancelled) as exc_info:
+            await run_cancellable(work, is_disconnected=is_disconnected, poll_interval=0.01)
+        assert exc_info.value.reason == DISCONNECT
+        assert work.cancelled()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_result_returned_before_deadline(self):
+        """Test that fast work is returned untouched."""
+        async def work():
+            return {"ok": True}
+
+        assert await run_cancellable(work(), timeout=1.0, is_disconnected=None) == {"ok": True}
+
+
+class TestSingleFlightCancellation:
+    """Test cases for cancelling shared work when its last caller leaves."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_shared_work_survives_until_last_caller_leaves(self):
+        """Test that one cancelled caller does not abort the work others still wait for."""
+        flight = SingleFlight()
+        model = SlowModel()
+        first = asyncio.create_task(flight.do("key", lambda: model.chat()))
+        second = asyncio.create_task(flight.do("key", lambda: model.chat()))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        await asyncio.sleep(0.01)
+        assert model.cancelled == 0 and flight.in_flight("key")
+
+        second.cancel()
+        await asyncio.sleep(0.01)
+        assert model.calls == 1 and model.cancelled == 1
+        assert not flight.in_flight("key")
+
+
+class TestCareerPlanCancellation:
+    """Test cases for aborting the Ollama call behind /career-plan."""
+
+    @pytest.mark.integration
+    def test_client_deadline_returns_504_and_aborts_generation(self, client, sample_job_request, temp_prompt_file):
+        """Test that X-Request-Timeout bounds the request and the model call is aborted."""
+        model = SlowModel()
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch('ollama.AsyncClient.chat', side_effect=model.chat):
+            response = client.post("/career-plan", json=sample_job_request, headers={"X-Request-Timeout": "0.1"})
+
+        assert response.status_code == 504
+        assert response.json()["detail"] == "Request deadline exceeded"
+        assert model.cancelled == 1
+        assert plan_scheduler.running == 0
+
+    @pytest.mark.unit
+    def test_invalid_client_timeout_rejected(self, client, sample_job_request):
+        """Test that a non-positive X-Request-Timeout is a validation error."""
+        response = client.post("/career-plan", json=sample_job_request, headers={"X-Request-Timeout": "0"})
+        assert response.status_code == 422
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_disconnect_aborts_generation(self, sample_job_request, temp_prompt_file):
+        """Test that a client disconnect aborts the model call and frees its slot."""
+        model = SlowModel()
+
+        async def is_disconnected():
+            return model.calls > 0
+
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch.object(settings, 'DISCONNECT_POLL_INTERVAL', 0.01), \
+                patch('ollama.AsyncClient.chat', side_effect=model.chat):
+            response = await generate_career_plan_logic(
+                sample_job_request["category"], sample_job_request["job_description"], sample_job_request["timeline"],
+                sample_job_request["user_id"], timeout=None, is_disconnected=is_disconnected,
+            )
+
+        assert response.status_code == 499
+        assert model.cancelled == 1
+        assert plan_scheduler.running == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_disconnect_aborts_batch_generations(self, sample_job_request, temp_prompt_file):
+        """Test that a client leaving a batch aborts every in-flight generation."""
+        model = SlowModel()
+        items = [{**sample_job_request, "job_description": f"{sample_job_request['job_description']} {i}"} for i in range(3)]
+
+        async def is_disconnected():
+            return model.calls == 3
+
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch.object(settings, 'DISCONNECT_POLL_INTERVAL', 0.01), \
+                patch.object(settings, 'BATCH_MAX_PARALLELISM', 3), \
+                patch('ollama.AsyncClient.chat', side_effect=model.chat):
+            response = await generate_career_plans_batch_logic(items, timeout=None, is_disconnected=is_disconnected)
+
+        assert response.status_code == 499
+        assert model.cancelled == 3
+        assert plan_scheduler.running == 0
+
+    @pytest.mark.integration
+    @pytest.mark.asyncio
+    async def test_http_disconnect_through_app_aborts_generation(self, sample_job_request, temp_prompt_file):
+        """Test that a real http.disconnect passes the middleware stack and aborts the model call."""
+        model = SlowModel()
+        body = json.dumps(sample_job_request).encode()
+        sent = []
+        delivered = False
+
+        async def receive():
+            nonlocal delivered
+            if not delivered:
+                delivered = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # The client goes away once generation has started
+            while not model.calls:
+                await asyncio.sleep(0.005)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST", "scheme": "http",
+            "path": "/career-plan", "raw_path": b"/career-plan", "root_path": "", "query_string": b"",
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+            "client": ("testclient", 50000), "server": ("testserver", 80),
+        }
+        before = metrics.CANCELLED_REQUESTS.labels(DISCONNECT)._value.get()
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch.object(settings, 'DISCONNECT_POLL_INTERVAL', 0.01), \
+                patch('ollama.AsyncClient.chat', side_effect=model.chat):
+            await asyncio.wait_for(app(scope, receive, send), timeout=5)
+
+        assert sent[0]["status"] == 499
+        assert model.cancelled == 1
+        assert plan_scheduler.running == 0
+        assert metrics.CANCELLED_REQUESTS.labels(DISCONNECT)._value.get() == before + 1
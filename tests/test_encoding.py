@@ -0,0 +1,129 @@
+import gzip
+import json
+
+import brotli
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.core.config import settings
+from app.core.encoding import EncodedBody, encoded_json_response, negotiate_encoding
+from app.services.career_service import get_career_plan_body
+from app.services.plan_cache import PlanCache
+
+LARGE_PLAN = {"skills": [
+    {"skill_name": f"Skill {s}", "total_days": 3, "topics": [
+        {"topic_name": f"Topic {t}", "study_material": f"https://example.com/{s}/{t}", "timeline": "1 day",
+         "priority": "High", "bonus": False}
+        for t in range(15)
+    ]}
+    for s in range(6)
+]}
+
+
+class TestNegotiateEncoding:
+    """Test cases for Accept-Encoding negotiation."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("header, expected", [
+        (None, None),
+        ("", None),
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br;q=0, gzip;q=0", None),
+        ("*", "br"),
+        ("*;q=0.2, gzip;q=0", "br"),
+        ("identity", None),
+        ("GZIP; Q=0.8", "gzip"),
+    ])
+    def test_negotiation(self, header, expected):
+        """Test q-values, wildcards and the server preference for brotli on ties."""
+        assert negotiate_encoding(header, ("br", "gzip")) == expected
+
+    @pytest.mark.unit
+    def test_brotli_unavailable(self):
+        """Test that gzip is chosen when brotli is not installed."""
+        assert negotiate_encoding("br, gzip", ("gzip",)) == "gzip"
+
+
+class TestEncodedJsonResponse:
+    """Test cases for serving pre-serialized bodies."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_compressed_variants_round_trip(self):
+        """Test that each encoding decodes to the same JSON and is much smaller."""
+        body = EncodedBody.from_content(LARGE_PLAN)
+        br = await encoded_json_response(body, "br")
+        gz = await encoded_json_response(body, "gzip")
+
+        assert br.headers["Content-Encoding"] == "br" and gz.headers["Content-Encoding"] == "gzip"
+        assert br.headers["Vary"] == "Accept-Encoding"
+        assert json.loads(brotli.decompress(br.body)) == LARGE_PLAN
+        assert json.loads(gzip.decompress(gz.body)) == LARGE_PLAN
+        assert len(br.body) < len(body.identity) / 5
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_variants_are_compressed_once(self):
+        """Test that repeat deliveries reuse the stored bytes."""
+        body = EncodedBody.from_content(LARGE_PLAN)
+        with patch('app.core.encoding._compress', side_effect=lambda data, encoding: b"compressed") as compress:
+            first = await encoded_json_response(body, "gzip")
+            second = await encoded_json_response(body, "gzip")
+        assert first.body == second.body == b"compressed"
+        compress.assert_called_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_small_bodies_stay_identity(self):
+        """Test that bodies below the size threshold are not compressed."""
+        response = await encoded_json_response(EncodedBody.from_content({"skills": []}), "gzip, br")
+        assert "Content-Encoding" not in response.headers
+        assert response.body == b'{"skills":[]}'
+
+
+class TestPlanCacheEncodedBodies:
+    """Test cases for encoded bodies stored next to cached plans."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_body_dropped_when_plan_changes(self):
+        """Test that a body is only returned for the plan it was encoded from."""
+        cache = PlanCache(max_entries=2, ttl_seconds=60)
+        await cache.set("k", LARGE_PLAN)
+        body = EncodedBody.from_content(LARGE_PLAN)
+        cache.attach_encoded("k", LARGE_PLAN, body)
+
+        assert cache.encoded("k", json.loads(json.dumps(LARGE_PLAN))) is body
+        assert cache.encoded("k", {"skills": []}) is None
+        await cache.set("k", {"skills": []})
+        assert cache.encoded("k", {"skills": []}) is None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_repeat_requests_reuse_body(self, temp_prompt_file):
+        """Test that a cached plan is serialized once across repeat requests."""
+        response = {"message": {"content": json.dumps(LARGE_PLAN)}}
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=response):
+            first = await get_career_plan_body("Backend", "Python", "3 weeks", "alice")
+            second = await get_career_plan_body("Backend", "Python", "3 weeks", "alice")
+            other_user = await get_career_plan_body("Backend", "Python", "3 weeks", "bob")
+        assert first is second is other_user
+
+
+class TestCareerPlanEndpointEncoding:
+    """Test cases for content negotiation on /career-plan."""
+
+    @pytest.mark.integration
+    def test_endpoint_serves_requested_encoding(self, client, sample_job_request, temp_prompt_file):
+        """Test that /career-plan answers with brotli, gzip or identity as negotiated."""
+        response = {"message": {"content": json.dumps(LARGE_PLAN)}}
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=response):
+            for accept, expected in (("br", "br"), ("gzip", "gzip"), ("identity", None)):
+                result = client.post("/career-plan", json=sample_job_request, headers={"Accept-Encoding": accept})
+                assert result.status_code == 200
+                assert result.headers.get("Content-Encoding") == expected
+                assert result.json() == LARGE_PLAN
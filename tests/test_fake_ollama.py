@@ -0,0 +1,73 @@
+import json
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+import ollama
+from app.core.config import settings
+from app.services.career_service import generate_career_plan_logic
+from app.services.ollama_pool import BackendPool
+from app.services.warmup import ModelWarmup
+from benchmarks.fake_ollama import FakeOllamaConfig, create_app
+
+
+def fake_client(config):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(config)), base_url="http://fake")
+
+
+class TestFakeOllama:
+    """Test cases for the fake Ollama server used by the load tests."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_blocking_chat_returns_plan_and_stats(self):
+        """Test that a non-streaming chat returns a schema-shaped plan with Ollama timing fields."""
+        async with fake_client(FakeOllamaConfig(latency=0, token_rate=1e6, tokens=200)) as client:
+            response = await client.post("/api/chat", json={"model": "m", "stream": False, "messages": []})
+
+        body = response.json()
+        plan = json.loads(body["message"]["content"])
+        assert plan["skills"][0]["topics"]
+        assert body["eval_count"] > 0 and body["done"] is True
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_streaming_chat_reassembles_to_plan(self):
+        """Test that streamed chunks concatenate to the full completion."""
+        async with fake_client(FakeOllamaConfig(latency=0, token_rate=1e6, tokens=200)) as client:
+            response = await client.post("/api/chat", json={"model": "m", "stream": True, "messages": []})
+
+        chunks = [json.loads(line) for line in response.text.splitlines()]
+        assert chunks[-1]["done"] is True
+        assert json.loads("".join(chunk["message"]["content"] for chunk in chunks))["skills"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_warmup_loads_model_on_fake_server(self):
+        """Test that the startup warm-up succeeds and the health check then sees the model as loaded."""
+        pool = BackendPool(["http://fake"])
+        pool.backends[0].client = ollama.AsyncClient(
+            host="http://fake", transport=httpx.ASGITransport(app=create_app(FakeOllamaConfig(latency=0)))
+        )
+        warmup = ModelWarmup()
+
+        assert await warmup.warm(pool)
+        await pool.check_health(timeout=1)
+        assert warmup.ready
+        await pool.close()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_service_against_fake_server(self, temp_prompt_file):
+        """Test the real Ollama client and career service end to end against the fake server."""
+        pool = BackendPool(["http://fake"])
+        pool.backends[0].client = ollama.AsyncClient(
+            host="http://fake", transport=httpx.ASGITransport(app=create_app(FakeOllamaConfig(latency=0, token_rate=1e6, tokens=300)))
+        )
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch('app.services.career_service.get_backend_pool', return_value=pool):
+            result = await generate_career_plan_logic("Android", "Kotlin", "1 week")
+
+        assert json.loads(result.body)["skills"][0]["skill_name"] == "Kotlin"
+        await pool.close()
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 import json
 
 
@@ -10,7 +10,7 @@ class TestIntegration:
     def test_end_to_end_career_plan_generation(self, client, sample_job_request, mock_ollama_response, temp_prompt_file):
         """Test complete flow from API request to response."""
         with patch('app.core.config.settings.PROMPT_TEMPLATE_PATH', temp_prompt_file):
-            with patch('app.services.career_service.ollama.chat', return_value=mock_ollama_response):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response):
                 # Make request
                 response = client.post("/career-plan", json=sample_job_request)
                 
@@ -68,7 +68,7 @@ class TestIntegration:
         ]
         
         with patch('app.core.config.settings.PROMPT_TEMPLATE_PATH', temp_prompt_file):
-            with patch('app.services.career_service.ollama.chat', return_value=mock_ollama_response):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response):
                 for request_data in requests_data:
                     response = client.post("/career-plan", json=request_data)
                     assert response.status_code == 200
@@ -0,0 +1,128 @@
+from pathlib import Path
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.core.config import settings
+from app.schemas.job import JobRequest
+from app.services.batch_service import generate_career_plans_batch
+from app.services.career_service import career_plan_key, get_career_plan, prepare_job_description
+from app.services.jd_preprocess import estimate_tokens, preprocess_job_description, strip_markup
+
+POSTING = Path(__file__).parent / "data" / "job_descriptions" / "android_posting.html"
+
+
+class TestPreprocessJobDescription:
+    """Test cases for reducing job postings to their canonical form."""
+
+    @pytest.mark.unit
+    def test_html_posting_keeps_only_requirements(self):
+        """Test that markup, company blurb, benefits and EEO text are removed and the role content kept."""
+        raw = POSTING.read_text()
+        processed = preprocess_job_description(raw)
+
+        assert "<" not in processed and "dataLayer" not in processed
+        assert "Kotlin & the Android SDK" in processed
+        assert "Requirements" in processed
+        for boilerplate in ("investors", "Unlimited PTO", "dental", "equal opportunity", "accommodation"):
+            assert boilerplate.lower() not in processed.lower()
+        assert processed.count("Jetpack Compose") == 1
+        assert estimate_tokens(processed) < estimate_tokens(raw) / 4
+
+    @pytest.mark.unit
+    def test_formatting_variants_share_canonical_form(self):
+        """Test that whitespace, bullet style, emphasis and markup differences do not change the result."""
+        plain = "Requirements:\n- Kotlin\n- Coroutines"
+        variants = [
+            "Requirements:\n* **Kotlin**\n*   Coroutines\n\n",
+            "<p>Requirements:</p><ul><li>- Kotlin</li><li>- Coroutines</li></ul>",
+            "  Requirements:  \n• Kotlin\n• Coroutines\n• Kotlin",
+        ]
+        for variant in variants:
+            assert preprocess_job_description(variant) == plain
+
+    @pytest.mark.unit
+    def test_boilerplate_section_ends_at_next_heading(self):
+        """Test that a benefits section is dropped but the heading after it is kept."""
+        text = "Perks:\n- Free lunch\nGym membership\nQualifications:\n- SQL"
+        assert preprocess_job_description(text) == "Qualifications:\n- SQL"
+
+    @pytest.mark.unit
+    def test_token_budget(self):
+        """Test that the output is cut to the token budget at a word boundary."""
+        text = "\n".join(f"Requirement number {i} is about distributed systems" for i in range(100))
+        processed = preprocess_job_description(text, max_tokens=50)
+        assert 40 <= estimate_tokens(processed) <= 50
+        assert processed.startswith("Requirement number 0")
+        assert not processed.endswith(" ")
+
+    @pytest.mark.unit
+    def test_never_empties_the_description(self):
+        """Test that a description consisting only of boilerplate falls back to the normalized text."""
+        assert preprocess_job_description("  Benefits:\n  Free   lunch ") == "Benefits: Free lunch"
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("text", [
+        "- <5 years of Python, >2 years of Go",
+        "Map<String, List<Integer>> generics",
+        "Optional<T> and Vec<u8>",
+    ])
+    def test_angle_brackets_that_are_not_tags_are_kept(self, text):
+        """Test that comparisons and generic types are not mistaken for HTML tags."""
+        assert preprocess_job_description(text) == text
+
+    @pytest.mark.unit
+    def test_inline_tags_are_stripped(self):
+        """Test that inline HTML tags, with attributes and in any case, are removed."""
+        assert strip_markup('<a href="x">Kotlin</a> <SPAN class="y">Go</SPAN> <b>Rust</b><img src="z"/>').split() == ["Kotlin", "Go", "Rust"]
+
+    @pytest.mark.unit
+    def test_strip_markup_unescapes_entities(self):
+        """Test that HTML entities are decoded and comments removed."""
+        assert strip_markup("R&amp;D <!-- hidden -->&lt;3").split() == ["R&D", "<3"]
+
+
+class TestPreprocessingInService:
+    """Test cases for preprocessing in the career plan service."""
+
+    @pytest.mark.unit
+    def test_equivalent_postings_share_cache_key(self, temp_prompt_file):
+        """Test that formatting-only differences map to the same cache key."""
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file):
+            html = career_plan_key("Android", "<ul><li>Kotlin</li><li>Kotlin</li></ul><h2>Benefits</h2><p>PTO</p>", "4 weeks")
+            text = career_plan_key("Android", "Kotlin", "4 weeks")
+        assert html == text
+
+    @pytest.mark.unit
+    def test_disabled_passes_description_through(self):
+        """Test that JD_PREPROCESS_ENABLED=False leaves the description untouched."""
+        with patch.object(settings, 'JD_PREPROCESS_ENABLED', False):
+            assert prepare_job_description("<b>Kotlin</b>") == "<b>Kotlin</b>"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_prompt_contains_processed_description(self, temp_prompt_file, mock_ollama_response):
+        """Test that the model receives the processed description."""
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response) as mock_chat:
+            await get_career_plan("Android", POSTING.read_text(), "4 weeks")
+
+        prompt = mock_chat.call_args.kwargs["messages"][0]["content"]
+        assert "Jetpack Compose" in prompt
+        assert "<li>" not in prompt and "Unlimited PTO" not in prompt
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_batch_preprocesses_each_item_once(self, temp_prompt_file, mock_ollama_response):
+        """Test that the batch path reuses the prepared description instead of preprocessing it again."""
+        batch = [JobRequest(user_id=user, category="Android", timeline="4 weeks", job_description="<p>Kotlin</p>")
+                 for user in ("alice", "bob")]
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch('app.services.career_service.preprocess_job_description', wraps=preprocess_job_description) as preprocess, \
+                patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response) as mock_chat:
+            results = await generate_career_plans_batch(batch)
+
+        assert [result.status for result in results] == ["ok", "ok"]
+        assert preprocess.call_count == len(batch)
+        assert mock_chat.await_count == 1
+        assert mock_chat.call_args.kwargs["messages"][0]["content"].count("<p>") == 0
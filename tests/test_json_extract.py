@@ -0,0 +1,67 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.schemas.plan import CareerPlan
+from app.services.json_extract import iter_json_candidates, parse_model_json, repair_json
+from benchmarks.fake_ollama import build_plan
+
+CORPUS = sorted((Path(__file__).parent / "data" / "model_outputs").glob("*.txt"))
+
+
+class TestParseModelJson:
+    """Test cases for extracting and repairing JSON from model completions."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("path", CORPUS, ids=[path.stem for path in CORPUS])
+    def test_corpus_outputs_parse(self, path):
+        """Test that every recorded real-world completion yields a schema-valid plan."""
+        plan = CareerPlan.model_validate(parse_model_json(path.read_text())).model_dump()
+        assert [skill["skill_name"] for skill in plan["skills"]] == ["Kotlin", "MVVM"]
+        assert plan["skills"][0]["topics"][0]["study_material"].startswith("https://")
+
+    @pytest.mark.unit
+    def test_braces_in_strings_are_ignored(self):
+        """Test that braces and fences inside strings do not end the object early."""
+        text = 'noise {"a": "} ``` {", "b": [1]} trailing }'
+        assert list(iter_json_candidates(text))[0] == '{"a": "} ``` {", "b": [1]}'
+
+    @pytest.mark.unit
+    def test_nested_objects_are_not_separate_candidates(self):
+        """Test that scanning resumes after each top-level object instead of inside it."""
+        text = 'a {"x": {"y": 1}} b {"z": 2}'
+        assert list(iter_json_candidates(text)) == ['{"x": {"y": 1}}', '{"z": 2}']
+
+    @pytest.mark.unit
+    def test_prefers_plan_over_earlier_example_object(self):
+        """Test that a small example object before the answer does not win over the plan."""
+        assert parse_model_json('Example: {"skill_name": "x"} then {"skills": []}') == {"skills": []}
+        assert parse_model_json('Example: {"a": 1} then {"b": [1, 2, 3]}', prefer_key=None) == {"b": [1, 2, 3]}
+
+    @pytest.mark.unit
+    def test_no_object_raises_decode_error(self):
+        """Test that completions without JSON raise json.JSONDecodeError."""
+        with pytest.raises(json.JSONDecodeError):
+            parse_model_json("I am unable to create a plan for this role.")
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("fragment, expected", [
+        ('{"a": [1, 2,], }', {"a": [1, 2]}),
+        ('{"a": [1, 2, {"b": ', {"a": [1, 2]}),
+        ('{"a": [{"b": 1}, {"c": [1, 2]}, {"d"', {"a": [{"b": 1}, {"c": [1, 2]}]}),
+        ('{"a": "x", "b', {"a": "x"}),
+        ('{"a": "trunc', {"a": "trunc"}),
+        ('{"a": [1}', {"a": [1]}),
+    ])
+    def test_repair(self, fragment, expected):
+        """Test repair of trailing commas, truncation and mismatched closers."""
+        assert json.loads(repair_json(fragment)) == expected
+
+    @pytest.mark.unit
+    def test_truncated_plans_stay_schema_valid(self):
+        """Test that a plan cut anywhere inside its skills array repairs to a schema-valid plan."""
+        plan = build_plan(300)
+        start = plan.index("[") + 1
+        for cut in range(start, len(plan)):
+            CareerPlan.model_validate(parse_model_json(plan[:cut]))
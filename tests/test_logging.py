@@ -0,0 +1,68 @@
+import json
+import logging
+
+import pytest
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.core.logging import JsonFormatter, log_payload, request_id_var, RequestIdFilter, TextFormatter
+
+
+class TestStructuredLogging:
+    """Test cases for structured logging helpers."""
+
+    @pytest.mark.unit
+    def test_json_formatter_includes_request_id_and_extras(self):
+        """Test that records render as JSON with the request id and extra fields."""
+        record = logging.LogRecord("kairos", logging.INFO, __file__, 1, "Plan for %s", ("alice",), None)
+        record.payload_chars = 42
+        token = request_id_var.set("req-1")
+        try:
+            RequestIdFilter().filter(record)
+        finally:
+            request_id_var.reset(token)
+
+        entry = json.loads(JsonFormatter().format(record))
+        assert entry["message"] == "Plan for alice"
+        assert entry["request_id"] == "req-1"
+        assert entry["payload_chars"] == 42
+
+    @pytest.mark.unit
+    def test_text_formatter_includes_payload(self):
+        """Test that text-mode lines carry the payload logged through log_payload."""
+        record = logging.LogRecord("kairos", logging.ERROR, __file__, 1, "Raw model response", None, None)
+        record.payload = "not json"
+        record.payload_chars = 8
+        RequestIdFilter().filter(record)
+
+        line = TextFormatter().format(record)
+        assert line.endswith("[None] Raw model response payload=not json payload_chars=8")
+
+    @pytest.mark.unit
+    def test_log_payload_truncates_large_payloads(self, caplog):
+        """Test that payloads are capped to LOG_PAYLOAD_MAX_CHARS."""
+        logger = logging.getLogger("kairos.test")
+        with patch.object(settings, 'LOG_PAYLOAD_SAMPLE_RATE', 1.0), \
+                patch.object(settings, 'LOG_PAYLOAD_MAX_CHARS', 10):
+            with caplog.at_level(logging.ERROR):
+                log_payload(logger, logging.ERROR, "Raw model response", "x" * 100)
+
+        record = caplog.records[-1]
+        assert record.payload == "x" * 10 + "...[truncated 90 chars]"
+        assert record.payload_chars == 100
+
+    @pytest.mark.unit
+    def test_log_payload_sampling(self, caplog):
+        """Test that unsampled payloads are not logged at all."""
+        logger = logging.getLogger("kairos.test")
+        with patch.object(settings, 'LOG_PAYLOAD_SAMPLE_RATE', 0.0):
+            with caplog.at_level(logging.DEBUG):
+                log_payload(logger, logging.ERROR, "Raw model response", "payload")
+
+        assert not [record for record in caplog.records if record.getMessage() == "Raw model response"]
+
+    @pytest.mark.unit
+    def test_request_id_is_echoed(self, client):
+        """Test that X-Request-ID is propagated, or generated when absent."""
+        assert client.get("/metrics", headers={"X-Request-ID": "abc123"}).headers["X-Request-ID"] == "abc123"
+        assert len(client.get("/metrics").headers["X-Request-ID"]) == 32
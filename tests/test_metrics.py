@@ -0,0 +1,51 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from prometheus_client import REGISTRY
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetrics:
+    """Test cases for Prometheus metrics and Server-Timing."""
+
+    @pytest.mark.unit
+    def test_metrics_endpoint_exposes_prometheus_text(self, client):
+        """Test that /metrics serves the Prometheus exposition format."""
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "kairos_request_duration_seconds" in response.text
+
+    @pytest.mark.unit
+    def test_career_plan_reports_server_timing_and_ollama_metrics(self, client, sample_job_request, mock_ollama_response, temp_prompt_file):
+        """Test that a generation exports Ollama counters and a per-stage Server-Timing header."""
+        ollama_response = dict(mock_ollama_response, total_duration=3_000_000_000, load_duration=500_000_000,
+                               prompt_eval_count=120, prompt_eval_duration=400_000_000,
+                               eval_count=800, eval_duration=2_000_000_000)
+        generated_before = sample("kairos_ollama_tokens_total", kind="generated")
+        load_before = sample("kairos_ollama_duration_seconds_count", phase="load")
+
+        with patch('app.core.config.settings.PROMPT_TEMPLATE_PATH', temp_prompt_file):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=ollama_response):
+                response = client.post("/career-plan", json=sample_job_request)
+
+        assert response.status_code == 200
+        timing = dict(entry.split(";dur=") for entry in response.headers["Server-Timing"].split(", "))
+        assert {"prompt", "queue", "model", "model_load", "prompt_eval", "generation", "parse", "total"} <= set(timing)
+        assert float(timing["generation"]) == pytest.approx(2000.0)
+        assert sample("kairos_ollama_tokens_total", kind="generated") - generated_before == 800
+        assert sample("kairos_ollama_duration_seconds_count", phase="load") - load_before == 1
+
+    @pytest.mark.unit
+    def test_parse_failures_are_counted(self, client, sample_job_request, temp_prompt_file):
+        """Test that unparseable model output increments the parse-failure counter."""
+        before = sample("kairos_parse_failures_total")
+        with patch('app.core.config.settings.PROMPT_TEMPLATE_PATH', temp_prompt_file):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value={"message": {"content": "nope"}}):
+                response = client.post("/career-plan", json=sample_job_request)
+
+        assert response.status_code == 500
+        assert sample("kairos_parse_failures_total") - before == 1
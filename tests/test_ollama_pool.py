@@ -0,0 +1,97 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from app.services.ollama_pool import BackendPool
+
+
+class _StubOllamaHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({"models": []}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_ollama_host():
+    """Run a local stub Ollama server that answers health checks."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOllamaHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def dead_ollama_host():
+    """Return the address of a port with nothing listening on it."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOllamaHandler)
+    port = server.server_address[1]
+    server.server_close()
+    return f"http://127.0.0.1:{port}"
+
+
+class TestBackendPool:
+    """Test cases for multi-host routing and health tracking."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_routes_to_least_outstanding(self):
+        """Test that concurrent leases spread evenly across hosts."""
+        pool = BackendPool(["http://a:11434", "http://b:11434", "http://c:11434"])
+        leases = [pool.lease() for _ in range(6)]
+        backends = [await lease.__aenter__() for lease in leases]
+
+        assert sorted(backend.outstanding for backend in pool.backends) == [2, 2, 2]
+        for lease in leases:
+            await lease.__aexit__(None, None, None)
+        assert all(backend.outstanding == 0 for backend in pool.backends)
+        await pool.close()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_connection_errors_eject_host(self):
+        """Test that a host is skipped after repeated connection failures."""
+        pool = BackendPool(["http://a:11434", "http://b:11434"], eject_after=2)
+
+        async def call():
+            async with pool.lease() as backend:
+                if backend.host == "http://a:11434":
+                    raise httpx.ConnectError("refused")
+
+        for _ in range(4):
+            try:
+                await call()
+            except httpx.ConnectError:
+                pass
+
+        bad, good = pool.backends
+        assert bad.ejected_until > time.monotonic()
+        assert good.failures == 0
+        assert {pool.pick().host for _ in range(4)} == {"http://b:11434"}
+        await pool.close()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_health_check_against_stub_servers(self, stub_ollama_host, dead_ollama_host):
+        """Test that health checks eject an unreachable host and keep a live one."""
+        pool = BackendPool([stub_ollama_host, dead_ollama_host], eject_after=1)
+        await pool.check_health(timeout=2)
+
+        live, dead = pool.backends
+        assert live.failures == 0
+        assert dead.failures == 1
+        assert {pool.pick().host for _ in range(4)} == {stub_ollama_host}
+        await pool.close()
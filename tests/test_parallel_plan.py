@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+import pytest
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.services.career_service import career_plan_key, get_career_plan
+from app.services.parallel_plan import SKILL_OUTLINE_SCHEMA, SKILL_TOPICS_SCHEMA
+from app.services.scheduler import plan_scheduler
+
+
+def topics_for(skill_name):
+    return {"topics": [
+        {"topic_name": f"{skill_name} basics", "study_material": "https://example.com", "timeline": "2 days", "priority": "High", "bonus": False},
+        {"topic_name": f"{skill_name} advanced", "study_material": "https://example.com", "timeline": "1 day", "priority": "Low", "bonus": True},
+    ]}
+
+
+class FakeModel:
+    """Answers skill-extraction and per-skill topic calls, recording the concurrency reached."""
+
+    def __init__(self, skills, delay=0.05):
+        self.skills = skills
+        self.delay = delay
+        self.topic_calls = []
+        self.active = 0
+        self.max_active = 0
+
+    async def chat(self, **kwargs):
+        prompt = kwargs["messages"][0]["content"]
+        if kwargs["format"] == SKILL_OUTLINE_SCHEMA:
+            content = {"skills": [{"skill_name": name, "total_days": days} for name, days in self.skills]}
+        else:
+            assert kwargs["format"] == SKILL_TOPICS_SCHEMA
+            skill_name = next(name for name, _ in self.skills if f"Skill: {name} " in prompt)
+            self.topic_calls.append(skill_name)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            await asyncio.sleep(self.delay)
+            self.active -= 1
+            content = topics_for(skill_name)
+        return {"message": {"content": json.dumps(content)}}
+
+
+@pytest.fixture
+def parallel_mode():
+    with patch.object(settings, 'GENERATION_MODE', 'parallel'):
+        yield
+
+
+class TestTwoPhaseGeneration:
+    """Test cases for skill extraction followed by concurrent per-skill topic generation."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_topics_generated_concurrently_and_merged(self, parallel_mode):
+        """Test that topic calls overlap and the merged plan keeps the extracted skill order."""
+        model = FakeModel([("Kotlin", 5), ("Coroutines", 3), ("Compose", 4)])
+        with patch('ollama.AsyncClient.chat', side_effect=model.chat):
+            plan = await get_career_plan("Android", "Kotlin, coroutines and Compose", "12 days", "alice")
+
+        assert [skill["skill_name"] for skill in plan["skills"]] == ["Kotlin", "Coroutines", "Compose"]
+        assert [skill["total_days"] for skill in plan["skills"]] == [5, 3, 4]
+        assert plan["skills"][1]["topics"][0]["topic_name"] == "Coroutines basics"
+        assert model.max_active == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_skill_topics_cached_across_plans(self, parallel_mode):
+        """Test that a skill already broken down for another job description is not generated again."""
+        with patch('ollama.AsyncClient.chat', side_effect=FakeModel([("Kotlin", 5)]).chat):
+            await get_career_plan("Android", "Kotlin developer", "5 days")
+
+        model = FakeModel([("Kotlin", 5), ("Gradle", 2)])
+        with patch('ollama.AsyncClient.chat', side_effect=model.chat):
+            plan = await get_career_plan("Android", "Kotlin and Gradle developer", "7 days")
+
+        assert model.topic_calls == ["Gradle"]
+        assert plan["skills"][0]["topics"] == topics_for("Kotlin")["topics"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_does_not_exceed_per_user_limit(self, parallel_mode):
+        """Test that fan-out wider than the per-user limit is not rejected."""
+        model = FakeModel([(f"Skill{i}", 1) for i in range(6)], delay=0.01)
+        with patch.object(plan_scheduler, 'per_user_limit', 1), \
+                patch('ollama.AsyncClient.chat', side_effect=model.chat):
+            plan = await get_career_plan("Backend", "Six skills", "6 days", "alice")
+        assert len(plan["skills"]) == 6
+
+    @pytest.mark.unit
+    def test_modes_use_distinct_cache_keys(self, temp_prompt_file):
+        """Test that plans generated in one mode are never served for the other."""
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file):
+            single = career_plan_key("Android", "Kotlin", "5 days")
+            with patch.object(settings, 'GENERATION_MODE', 'parallel'):
+                parallel = career_plan_key("Android", "Kotlin", "5 days")
+        assert single != parallel
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_invalid_topics_fail_the_plan(self, parallel_mode):
+        """Test that a topic breakdown violating the schema surfaces as a 500."""
+        from fastapi import HTTPException
+
+        model = FakeModel([("Kotlin", 5)])
+
+        async def bad_topics(**kwargs):
+            if kwargs["format"] == SKILL_TOPICS_SCHEMA:
+                return {"message": {"content": '{"topics": [{"topic_name": "x"}]}'}}
+            return await model.chat(**kwargs)
+
+        with patch('ollama.AsyncClient.chat', side_effect=bad_topics):
+            with pytest.raises(HTTPException) as exc_info:
+                await get_career_plan("Android", "Kotlin developer", "5 days")
+        assert exc_info.value.status_code == 500
+        assert exc_info.value.detail == "Model response does not match the career plan schema"
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.core.config import settings
+from app.services.career_service import generate_career_plan_logic
+from app.services.plan_cache import PlanCache, make_cache_key
+
+
+class TestMakeCacheKey:
+    """Test cases for plan cache key construction."""
+
+    @pytest.mark.unit
+    def test_key_ignores_whitespace_and_case(self):
+        """Test that cosmetically different inputs share a key."""
+        a = make_cache_key("Android", "MVVM  and Kotlin", "1 Week", "model", "template")
+        b = make_cache_key(" android ", "MVVM and\nKotlin", "1 week", "model", "template")
+        assert a == b
+
+    @pytest.mark.unit
+    def test_key_covers_model_and_template(self):
+        """Test that the model tag and prompt template are part of the key."""
+        base = make_cache_key("Android", "MVVM", "1 week", "model", "template")
+        assert base != make_cache_key("Android", "MVVM", "1 week", "other-model", "template")
+        assert base != make_cache_key("Android", "MVVM", "1 week", "model", "other template")
+
+
+class TestPlanCache:
+    """Test cases for the PlanCache LRU/TTL store."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = PlanCache(max_entries=2, ttl_seconds=60)
+        await cache.set("a", {"v": 1})
+        await cache.set("b", {"v": 2})
+        assert await cache.get("a") == {"v": 1}
+        await cache.set("c", {"v": 3})
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == {"v": 1}
+        assert await cache.get("c") == {"v": 3}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self):
+        """Test that expired entries are not returned."""
+        cache = PlanCache(max_entries=2, ttl_seconds=60)
+        with patch('app.services.plan_cache.time.time', return_value=1000.0):
+            await cache.set("a", {"v": 1})
+        with patch('app.services.plan_cache.time.time', return_value=1061.0):
+            assert await cache.get("a") is None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_sqlite_tier_survives_restart(self, tmp_path):
+        """Test that entries persisted to SQLite are visible to a new cache instance."""
+        db_path = str(tmp_path / "cache.db")
+        await PlanCache(max_entries=2, ttl_seconds=60, db_path=db_path).set("a", {"v": 1})
+
+        restarted = PlanCache(max_entries=2, ttl_seconds=60, db_path=db_path)
+        assert await restarted.get("a") == {"v": 1}
+
+
+class TestCareerPlanCaching:
+    """Test cases for caching in generate_career_plan_logic."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_repeat_request_skips_model(self, temp_prompt_file, mock_ollama_response):
+        """Test that an identical request is served from the cache."""
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response) as chat:
+                first = await generate_career_plan_logic("Android", "MVVM", "1 week")
+                second = await generate_career_plan_logic("android", " MVVM ", "1 week")
+
+        assert chat.await_count == 1
+        assert json.loads(second.body) == json.loads(first.body)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_generation_is_not_cached(self, temp_prompt_file, mock_ollama_response):
+        """Test that parse failures are retried instead of cached."""
+        invalid_response = {"message": {"content": "not json"}}
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, side_effect=[invalid_response, mock_ollama_response]) as chat:
+                with pytest.raises(Exception):
+                    await generate_career_plan_logic("Android", "MVVM", "1 week")
+                result = await generate_career_plan_logic("Android", "MVVM", "1 week")
+
+        assert chat.await_count == 2
+        assert "skills" in json.loads(result.body)
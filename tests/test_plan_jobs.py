@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, patch
+
+from app.core.config import settings
+from app.main import app
+from app.schemas.job import JobRequest
+from app.services.plan_jobs import FAILED, QUEUED, SUCCEEDED, PlanJobStore, PlanJobWorkers, plan_jobs
+
+
+@pytest.fixture
+def job_store(tmp_path):
+    store = PlanJobStore(str(tmp_path / "jobs.db"))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def jobs_client(job_store, temp_prompt_file):
+    """Test client with the app lifespan running, so job workers are started."""
+    with patch.object(plan_jobs, 'store', job_store), \
+            patch.object(settings, 'OLLAMA_HEALTH_CHECK_INTERVAL', 0), \
+            patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file):
+        with TestClient(app) as client:
+            yield client
+
+
+def wait_for_status(client, job_id, wanted, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/career-plan/jobs/{job_id}").json()
+        if job["status"] in wanted:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} never reached {wanted}")
+
+
+class TestCareerPlanJobs:
+    """Test cases for the submit/poll/fetch job endpoints."""
+
+    @pytest.mark.integration
+    def test_submit_poll_and_fetch(self, jobs_client, sample_job_request, mock_ollama_response):
+        """Test that a submitted job returns immediately and later yields the plan."""
+        with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response):
+            response = jobs_client.post("/career-plan/jobs", json=sample_job_request)
+            assert response.status_code == 202
+            job_id = response.json()["job_id"]
+            assert response.json()["status"] == QUEUED
+
+            job = wait_for_status(jobs_client, job_id, {SUCCEEDED, FAILED})
+
+        assert job["status"] == SUCCEEDED
+        assert job["user_id"] == sample_job_request["user_id"]
+        result = jobs_client.get(f"/career-plan/jobs/{job_id}/result")
+        assert result.status_code == 200
+        assert result.json()["skills"][0]["skill_name"] == "Python"
+
+    @pytest.mark.integration
+    def test_failed_job_reports_error(self, jobs_client, sample_job_request):
+        """Test that a failed generation is reported on the result endpoint."""
+        with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, side_effect=Exception("Ollama connection failed")):
+            job_id = jobs_client.post("/career-plan/jobs", json=sample_job_request).json()["job_id"]
+            job = wait_for_status(jobs_client, job_id, {SUCCEEDED, FAILED})
+
+        assert job["status"] == FAILED
+        result = jobs_client.get(f"/career-plan/jobs/{job_id}/result")
+        assert result.status_code == 500
+        assert "Ollama connection failed" in result.json()["detail"]
+
+    @pytest.mark.unit
+    def test_unknown_job(self, jobs_client):
+        """Test that unknown job ids return 404."""
+        assert jobs_client.get("/career-plan/jobs/missing").status_code == 404
+        assert jobs_client.get("/career-plan/jobs/missing/result").status_code == 404
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_unfinished_jobs_resume_after_restart(self, job_store, sample_job_request, mock_ollama_response, temp_prompt_file):
+        """Test that jobs persisted before a restart are picked up by new workers."""
+        job = await job_store.create(JobRequest(**sample_job_request))
+        workers = PlanJobWorkers(job_store, workers=2, max_pending=10)
+
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response):
+                await workers.start()
+                await asyncio.wait_for(workers._queue.join(), timeout=5)
+                stored = await job_store.get(job["id"])
+                await workers.stop()
+
+        assert stored["status"] == SUCCEEDED
+        assert stored["result"]["skills"][0]["skill_name"] == "Python"
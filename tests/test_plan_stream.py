@@ -0,0 +1,87 @@
+import json
+import pytest
+
+from app.services.plan_stream import IncrementalPlanParser
+
+
+PLAN = {
+    "skills": [
+        {
+            "skill_name": "Kotlin",
+            "total_days": 3,
+            "topics": [
+                {"topic_name": "Coroutines {async}", "study_material": "https://kotlinlang.org/docs/coroutines-overview.html", "timeline": "1 day", "priority": "High", "bonus": False},
+                {"topic_name": "Flows \"cold\" vs hot", "study_material": "https://kotlinlang.org/docs/flow.html", "timeline": "2 days", "priority": "Medium", "bonus": True},
+            ],
+        },
+        {
+            "skill_name": "MVVM",
+            "total_days": 4,
+            "topics": [
+                {"topic_name": "ViewModel", "study_material": "https://developer.android.com/topic/libraries/architecture/viewmodel", "timeline": "4 days", "priority": "High", "bonus": False},
+            ],
+        },
+    ]
+}
+
+
+def feed_all(parser, text, size):
+    events = []
+    for i in range(0, len(text), size):
+        events.extend(parser.feed(text[i:i + size]))
+    return events
+
+
+class TestIncrementalPlanParser:
+    """Test cases for the incremental streamed-plan parser."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("chunk_size", [1, 7, 10_000])
+    def test_emits_topics_and_skills_in_order(self, chunk_size):
+        """Test that every topic and skill is emitted once, regardless of chunking."""
+        text = "Here is your plan:\n```json\n" + json.dumps(PLAN, indent=2) + "\n```\nGood luck!"
+        parser = IncrementalPlanParser()
+        events = feed_all(parser, text, chunk_size)
+
+        assert [(e["event"], e.get("skill_index"), e["index"]) for e in events] == [
+            ("topic", 0, 0),
+            ("topic", 0, 1),
+            ("skill", None, 0),
+            ("topic", 1, 0),
+            ("skill", None, 1),
+        ]
+        assert events[1]["data"] == PLAN["skills"][0]["topics"][1]
+        assert events[2]["data"] == PLAN["skills"][0]
+        assert parser.done
+        assert parser.result() == PLAN
+
+    @pytest.mark.unit
+    def test_emits_skill_before_root_closes(self):
+        """Test that a skill is available before the rest of the completion arrives."""
+        text = json.dumps(PLAN)
+        cut = text.index('{"skill_name": "MVVM"')
+        parser = IncrementalPlanParser()
+        events = parser.feed(text[:cut])
+
+        assert events[-1]["event"] == "skill"
+        assert events[-1]["data"]["skill_name"] == "Kotlin"
+        assert not parser.done
+
+    @pytest.mark.unit
+    def test_truncated_completion_is_repaired(self):
+        """Test that an unterminated completion keeps every skill that did complete."""
+        text = json.dumps(PLAN)
+        parser = IncrementalPlanParser()
+        parser.feed(text[:text.index('{"skill_name": "MVVM"') + 30])
+
+        # The half-written MVVM skill is dropped rather than returned without its days and topics
+        assert parser.result() == {"skills": [PLAN["skills"][0]]}
+
+    @pytest.mark.unit
+    def test_no_json_in_completion(self):
+        """Test that a completion without any object raises a JSON decode error."""
+        parser = IncrementalPlanParser()
+        assert parser.feed("I cannot help with that.") == []
+
+        with pytest.raises(json.JSONDecodeError):
+            parser.result()
@@ -0,0 +1,76 @@
+import os
+import pytest
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.services.career_service import get_prompt
+from app.services.prompt_template import PromptTemplate, TemplateRegistry, template_path_for
+
+
+class TestPromptTemplate:
+    """Test cases for PromptTemplate parsing and rendering."""
+
+    @pytest.mark.unit
+    def test_render_is_single_pass(self):
+        """Test that placeholder-like text inside values is not substituted again."""
+        template = PromptTemplate("JD: {job_description} in {timeline}")
+        result = template.render(job_description="Ship by {timeline}", timeline="2 weeks")
+        assert result == "JD: Ship by {timeline} in 2 weeks"
+
+    @pytest.mark.unit
+    def test_json_braces_are_literals(self, temp_prompt_file):
+        """Test that JSON examples in the template are not treated as placeholders."""
+        with open(temp_prompt_file) as f:
+            template = PromptTemplate(f.read())
+        assert template.placeholders == ("category", "job_description", "timeline")
+        assert '"skill_name": "string"' in template.render(category="c", job_description="j", timeline="t")
+
+    @pytest.mark.unit
+    def test_missing_values_are_left_in_place(self):
+        """Test that placeholders without a value are rendered verbatim."""
+        assert PromptTemplate("{category}/{other}").render(category="x") == "x/{other}"
+
+
+class TestTemplateRegistry:
+    """Test cases for cached template loading and hot reload."""
+
+    @pytest.mark.unit
+    def test_template_is_read_once(self, temp_prompt_file):
+        """Test that an unchanged template is served without reopening the file."""
+        registry = TemplateRegistry(check_interval=0)
+        first = registry.get(temp_prompt_file)
+        with patch('builtins.open', side_effect=AssertionError("template re-read")):
+            assert registry.get(temp_prompt_file) is first
+
+    @pytest.mark.unit
+    def test_template_reloads_when_mtime_changes(self, temp_prompt_file):
+        """Test that editing the file is picked up on the next lookup."""
+        registry = TemplateRegistry(check_interval=0)
+        registry.get(temp_prompt_file)
+        with open(temp_prompt_file, 'w') as f:
+            f.write("New template for {category}")
+        stat = os.stat(temp_prompt_file)
+        os.utime(temp_prompt_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert registry.get(temp_prompt_file).render(category="QA") == "New template for QA"
+
+    @pytest.mark.unit
+    def test_check_interval_skips_stat(self, temp_prompt_file):
+        """Test that no filesystem call is made within the check interval."""
+        registry = TemplateRegistry(check_interval=60)
+        first = registry.get(temp_prompt_file)
+        with patch('app.services.prompt_template.os.stat', side_effect=AssertionError("stat on hot path")):
+            assert registry.get(temp_prompt_file) is first
+
+    @pytest.mark.unit
+    def test_category_templates(self, temp_prompt_file, tmp_path):
+        """Test that a per-category template is used when configured."""
+        android = tmp_path / "android.txt"
+        android.write_text("Android plan for {job_description}")
+        paths = {"Android": str(android)}
+
+        assert template_path_for(" android ", temp_prompt_file, paths) == str(android)
+        assert template_path_for("QA", temp_prompt_file, paths) == temp_prompt_file
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch.object(settings, 'PROMPT_TEMPLATES', paths):
+            assert get_prompt("Android", "MVVM", "1 week") == "Android plan for MVVM"
@@ -0,0 +1,124 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.scheduler import AdmissionRejected, FairScheduler, plan_scheduler
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestFairScheduler:
+    """Test cases for admission control and fair dispatch."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_round_robin_across_users(self):
+        """Test that a user with a deep backlog cannot starve other users."""
+        scheduler = FairScheduler(max_concurrency=1, max_queue=10, per_user_limit=10, retry_after=1)
+        order = []
+
+        async def job(user, tag):
+            async with scheduler.slot(user):
+                order.append(tag)
+                await asyncio.sleep(0)
+
+        await scheduler.acquire("blocker")
+        tasks = [asyncio.create_task(job("heavy", f"heavy-{i}")) for i in range(3)]
+        await settle()
+        tasks.append(asyncio.create_task(job("light", "light-0")))
+        await settle()
+        scheduler.release("blocker")
+        await asyncio.gather(*tasks)
+
+        assert order == ["heavy-0", "light-0", "heavy-1", "heavy-2"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_per_user_limit_rejects_with_429(self):
+        """Test that a user over budget is rejected immediately."""
+        scheduler = FairScheduler(max_concurrency=4, max_queue=10, per_user_limit=2, retry_after=3)
+        await scheduler.acquire("alice")
+        await scheduler.acquire("alice")
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await scheduler.acquire("alice")
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.retry_after >= 3
+
+        await scheduler.acquire("bob")
+        assert scheduler.running == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_with_503(self):
+        """Test that requests beyond the queue bound are rejected instead of queued."""
+        scheduler = FairScheduler(max_concurrency=1, max_queue=1, per_user_limit=0, retry_after=2)
+        await scheduler.acquire("a")
+        waiter = asyncio.create_task(scheduler.acquire("b"))
+        await settle()
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await scheduler.acquire("c")
+        assert exc_info.value.status_code == 503
+
+        scheduler.release("a")
+        await waiter
+        assert scheduler.running == 1
+        assert scheduler.queued == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Test that a cancelled waiter frees its queue position and user budget."""
+        scheduler = FairScheduler(max_concurrency=1, max_queue=5, per_user_limit=1, retry_after=1)
+        await scheduler.acquire("a")
+        waiter = asyncio.create_task(scheduler.acquire("b"))
+        await settle()
+        waiter.cancel()
+        await settle()
+
+        assert scheduler.queued == 0
+        scheduler.release("a")
+        await scheduler.acquire("b")
+        assert scheduler.running == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_reservation_charges_user_once(self):
+        """Test that reserved slots share one per-user admission but still respect the slot limit."""
+        scheduler = FairScheduler(max_concurrency=2, max_queue=10, per_user_limit=1, retry_after=1)
+        async with scheduler.reservation("alice"):
+            with pytest.raises(AdmissionRejected):
+                await scheduler.acquire("alice")
+            await scheduler.acquire("alice", reserved=True)
+            await scheduler.acquire("alice", reserved=True)
+            waiter = asyncio.create_task(scheduler.acquire("alice", reserved=True))
+            await settle()
+            assert scheduler.running == 2 and scheduler.queued == 1
+
+            scheduler.release("alice", reserved=True)
+            await waiter
+            scheduler.release("alice", reserved=True)
+            scheduler.release("alice", reserved=True)
+
+        assert scheduler.running == 0
+        await scheduler.acquire("alice")
+
+
+class TestAdmissionEndpoint:
+    """Test cases for backpressure responses on /career-plan."""
+
+    @pytest.mark.unit
+    def test_rejected_request_returns_retry_after(self, client, sample_job_request, mock_ollama_response, temp_prompt_file):
+        """Test that an over-budget user gets a fast 429 with Retry-After."""
+        with patch('app.core.config.settings.PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch.object(plan_scheduler, 'admit', side_effect=AdmissionRejected("Too many concurrent requests for this user", 429, 7)):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response) as chat:
+                response = client.post("/career-plan", json=sample_job_request)
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "7"
+        chat.assert_not_awaited()
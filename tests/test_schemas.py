@@ -1,6 +1,7 @@
 import pytest
 from pydantic import ValidationError
 from app.schemas.job import JobRequest
+from app.schemas.plan import CareerPlan, Topic
 
 
 class TestJobRequest:
@@ -65,3 +66,37 @@ class TestJobRequest:
         # Pydantic v2 doesn't coerce int to str by default
         with pytest.raises(ValidationError):
             JobRequest(**data)
+
+
+class TestCareerPlan:
+    """Test cases for CareerPlan schema."""
+
+    @pytest.mark.unit
+    def test_career_plan_coerces_model_types(self):
+        """Test that stringly-typed model output is coerced to the declared types."""
+        plan = CareerPlan.model_validate({
+            "skills": [{
+                "skill_name": "Python",
+                "total_days": "10",
+                "topics": [{"topic_name": "FastAPI", "study_material": "https://fastapi.tiangolo.com/",
+                            "timeline": "3 days", "priority": "High", "bonus": "false"}],
+            }],
+            "commentary": "Good luck!"
+        })
+        assert plan.skills[0].total_days == 10
+        assert plan.skills[0].topics[0].bonus is False
+        assert "commentary" not in plan.model_dump()
+
+    @pytest.mark.unit
+    def test_career_plan_rejects_unknown_priority(self):
+        """Test that priorities outside High/Medium/Low are rejected."""
+        with pytest.raises(ValidationError):
+            Topic(topic_name="x", study_material="https://x", timeline="1 day", priority="Urgent", bonus=False)
+
+    @pytest.mark.unit
+    def test_career_plan_json_schema(self):
+        """Test that the JSON Schema sent to Ollama describes the nested plan."""
+        schema = CareerPlan.model_json_schema()
+        assert schema["required"] == ["skills"]
+        assert set(schema["$defs"]) == {"Skill", "Topic"}
+        assert schema["$defs"]["Topic"]["properties"]["priority"]["enum"] == ["High", "Medium", "Low"]
@@ -0,0 +1,111 @@
+import hashlib
+import json
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.core.config import settings
+from app.services.career_service import generate_career_plan_logic
+from app.services.semantic_cache import SemanticPlanCache, semantic_cache, semantic_cache_text
+
+
+async def bag_of_words_embedder(texts):
+    """Deterministic stand-in for an embedding model: hashed bag of words."""
+    vectors = np.zeros((len(texts), 64), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in text.replace(",", " ").split():
+            vectors[row, int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1.0
+    return vectors
+
+
+class TestSemanticPlanCache:
+    """Test cases for the embedding similarity index."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_near_duplicate_matches(self):
+        """Test that a reworded description returns the stored plan."""
+        cache = SemanticPlanCache(bag_of_words_embedder, threshold=0.8, capacity=8)
+        stored = await cache.embed([semantic_cache_text("Android", "Android developer, MVVM, Kotlin", "1 week")])
+        cache.add(stored[0], "scope", {"skills": ["stored"]})
+
+        queries = await cache.embed([
+            semantic_cache_text("Android", "Kotlin Android developer MVVM", "1 week"),
+            semantic_cache_text("Data", "SQL analyst with Tableau dashboards", "1 month"),
+        ])
+        assert cache.match(queries, "scope") == [{"skills": ["stored"]}, None]
+        assert cache.match(queries, "other-scope") == [None, None]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_capacity_overwrites_oldest(self):
+        """Test that the index never grows past its capacity."""
+        cache = SemanticPlanCache(bag_of_words_embedder, threshold=0.99, capacity=2)
+        texts = ["alpha beta", "gamma delta", "epsilon zeta"]
+        vectors = await cache.embed(texts)
+        for vector, text in zip(vectors, texts):
+            cache.add(vector, "scope", {"text": text})
+
+        assert len(cache) == 2
+        assert cache.match(vectors, "scope") == [None, {"text": "gamma delta"}, {"text": "epsilon zeta"}]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_overwritten_scopes_are_forgotten(self):
+        """Test that scopes only live in their slots, so free-text scopes cannot grow the index."""
+        cache = SemanticPlanCache(bag_of_words_embedder, threshold=0.99, capacity=2)
+        vector = (await cache.embed(["alpha beta"]))[0]
+        for i in range(1000):
+            cache.add(vector, f"scope-{i}", {"scope": i})
+
+        assert cache.match(vector[None, :], "scope-0") == [None]
+        assert cache.match(vector[None, :], "scope-999") == [{"scope": 999}]
+
+
+class TestSemanticCaching:
+    """Test cases for the semantic tier in the career service."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_reworded_request_skips_model(self, temp_prompt_file, mock_ollama_response):
+        """Test that a near-duplicate request is answered without a second generation."""
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch.object(settings, 'SEMANTIC_CACHE_ENABLED', True), \
+                patch.object(semantic_cache, 'embedder', bag_of_words_embedder), \
+                patch.object(semantic_cache, 'threshold', 0.8):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response) as chat:
+                first = await generate_career_plan_logic("Android", "Android developer, MVVM, Kotlin", "1 week")
+                second = await generate_career_plan_logic("Android", "Kotlin Android developer MVVM", "1 week")
+
+        assert chat.await_count == 1
+        assert json.loads(second.body) == json.loads(first.body)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_other_timeline_or_category_is_generated(self, temp_prompt_file, mock_ollama_response):
+        """Test that a similar description never reuses a plan made for another timeline or category."""
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch.object(settings, 'SEMANTIC_CACHE_ENABLED', True), \
+                patch.object(semantic_cache, 'embedder', bag_of_words_embedder), \
+                patch.object(semantic_cache, 'threshold', 0.5):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response) as chat:
+                await generate_career_plan_logic("Android", "Android developer, MVVM, Kotlin", "1 week")
+                await generate_career_plan_logic("Android", "Android developer, MVVM, Kotlin", "6 months")
+                await generate_career_plan_logic("Mobile", "Android developer, MVVM, Kotlin", "1 week")
+                await generate_career_plan_logic(" android ", "Kotlin Android developer MVVM", "1  Week")
+
+        assert chat.await_count == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_embedding_failure_falls_back_to_model(self, temp_prompt_file, mock_ollama_response):
+        """Test that an unavailable embedding model does not fail the request."""
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch.object(settings, 'SEMANTIC_CACHE_ENABLED', True), \
+                patch.object(semantic_cache, 'embedder', AsyncMock(side_effect=Exception("model not found"))):
+            with patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response) as chat:
+                result = await generate_career_plan_logic("Android", "MVVM", "1 week")
+
+        assert chat.await_count == 1
+        assert "skills" in json.loads(result.body)
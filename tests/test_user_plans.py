@@ -0,0 +1,141 @@
+import json
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.core.config import settings
+from app.services.user_plans import UserPlanStore, user_plans
+
+PLAN = {"skills": [{"skill_name": "Python", "total_days": 5, "topics": []}]}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = UserPlanStore(str(tmp_path / "plans.db"))
+    yield store
+    store.close()
+
+
+class TestUserPlanStore:
+    """Test cases for the SQLite-backed per-user plan history."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_save_is_idempotent_per_input(self, store):
+        """Test that saving the same inputs again updates one record and changes its ETag."""
+        first = await store.save("alice", "hash-1", "Backend", "1 week", "Python", PLAN)
+        second = await store.save("alice", "hash-1", "Backend", "1 week", "Python", {"skills": []})
+
+        assert first["id"] == second["id"]
+        assert first["etag"] != second["etag"]
+        assert (await store.find("alice", "hash-1"))["plan_json"] == '{"skills":[]}'
+        assert await store.find("bob", "hash-1") is None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cursor_pagination_newest_first(self, store):
+        """Test that pages follow each other without gaps or repeats and only cover the user's plans."""
+        for i in range(5):
+            await store.save("alice", f"hash-{i}", "Backend", f"{i} weeks", "Python", PLAN)
+        await store.save("bob", "hash-x", "Backend", "1 week", "Go", PLAN)
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = await store.list("alice", 2, cursor)
+            seen.extend(record["timeline"] for record in page)
+            assert "plan_json" not in page[0]
+            if cursor is None:
+                break
+        assert seen == [f"{i} weeks" for i in reversed(range(5))]
+
+
+class TestUserPlanEndpoints:
+    """Test cases for /users/{user_id}/plans."""
+
+    @pytest.mark.integration
+    def test_generated_plan_is_listed_and_fetched(self, client, sample_job_request, mock_ollama_response, temp_prompt_file):
+        """Test that a generated plan is stored for the user and served with an ETag."""
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response):
+            assert client.post("/career-plan", json=sample_job_request).status_code == 200
+
+        user_id = sample_job_request["user_id"]
+        page = client.get(f"/users/{user_id}/plans").json()
+        assert page["next_cursor"] is None
+        assert len(page["plans"]) == 1
+        plan_id = page["plans"][0]["plan_id"]
+
+        response = client.get(f"/users/{user_id}/plans/{plan_id}")
+        assert response.status_code == 200
+        assert response.json()["plan"]["skills"][0]["skill_name"] == "Python"
+        assert response.json()["category"] == sample_job_request["category"]
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+        etag = response.headers["ETag"]
+        not_modified = client.get(f"/users/{user_id}/plans/{plan_id}", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["ETag"] == etag
+        assert client.get(f"/users/{user_id}/plans/{plan_id}", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+    @pytest.mark.integration
+    def test_repeat_request_served_from_history(self, client, sample_job_request, mock_ollama_response, temp_prompt_file):
+        """Test that the same user repeating a request does not reach the model, even after a cache flush."""
+        from app.services.plan_cache import plan_cache
+
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response) as mock_chat:
+            first = client.post("/career-plan", json=sample_job_request)
+            plan_cache.clear()
+            second = client.post("/career-plan", json=sample_job_request)
+
+        assert second.json() == first.json()
+        assert mock_chat.await_count == 1
+
+    @pytest.mark.integration
+    def test_batch_stores_plan_for_every_user(self, client, sample_job_request, mock_ollama_response, temp_prompt_file):
+        """Test that users sharing one batch generation all get the plan in their history."""
+        batch = {"requests": [{**sample_job_request, "user_id": user} for user in ("alice", "bob", "alice")]}
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response) as mock_chat:
+            assert client.post("/career-plans/batch", json=batch).status_code == 200
+
+        assert mock_chat.await_count == 1
+        for user in ("alice", "bob"):
+            assert len(client.get(f"/users/{user}/plans").json()["plans"]) == 1
+
+    @pytest.mark.integration
+    def test_streamed_plan_is_stored(self, client, sample_job_request, mock_ollama_response, temp_prompt_file):
+        """Test that a streamed plan is stored once the final event is sent and then served from history."""
+        content = mock_ollama_response["message"]["content"]
+
+        async def chunks():
+            yield {"message": {"content": content}, "done": True}
+
+        with patch.object(settings, 'PROMPT_TEMPLATE_PATH', temp_prompt_file), \
+                patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=chunks()) as mock_chat:
+            streamed = client.post("/career-plan/stream", json=sample_job_request)
+            from app.services.plan_cache import plan_cache
+            plan_cache.clear()
+            repeated = client.post("/career-plan", json=sample_job_request)
+
+        plans = client.get(f"/users/{sample_job_request['user_id']}/plans").json()["plans"]
+        assert len(plans) == 1
+        assert repeated.json() == json.loads(streamed.text.splitlines()[-1])["data"]
+        assert mock_chat.await_count == 1
+
+    @pytest.mark.integration
+    def test_other_users_plans_are_not_found(self, client):
+        """Test that plan ids are scoped to their user."""
+        import asyncio
+        record = asyncio.run(user_plans.save("alice", "hash-1", "Backend", "1 week", "Python", PLAN))
+        user_plans.close()
+
+        assert client.get(f"/users/alice/plans/{record['id']}").status_code == 200
+        assert client.get(f"/users/mallory/plans/{record['id']}").status_code == 404
+
+    @pytest.mark.unit
+    def test_invalid_cursor_and_limit(self, client):
+        """Test that malformed pagination parameters are rejected."""
+        assert client.get("/users/alice/plans?cursor=abc").status_code == 400
+        assert client.get("/users/alice/plans?limit=0").status_code == 422
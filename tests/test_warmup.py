@@ -0,0 +1,178 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, patch
+
+from app.core.config import settings
+from app.main import app
+from app.services.ollama_pool import BackendPool, model_request_options
+from app.services.warmup import ModelWarmup
+
+
+async def until(condition):
+    while not condition():
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def lifespan_settings():
+    """Disable background health checks so only the warm-up talks to the (mocked) backend."""
+    with patch.object(settings, 'OLLAMA_HEALTH_CHECK_INTERVAL', 0):
+        yield
+
+
+class TestModelRequestOptions:
+    """Test cases for the keep_alive/options shared by warm-up and generation."""
+
+    @pytest.mark.unit
+    def test_default_options(self):
+        """Test that keep_alive is always sent and num_ctx only when configured."""
+        with patch.object(settings, 'OLLAMA_NUM_CTX', 0):
+            assert model_request_options() == {"keep_alive": settings.OLLAMA_KEEP_ALIVE}
+        with patch.object(settings, 'OLLAMA_NUM_CTX', 8192):
+            assert model_request_options()["options"] == {"num_ctx": 8192}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_generation_uses_same_options(self, sample_job_request, mock_ollama_response):
+        """Test that the chat call passes keep_alive and num_ctx so the warm model is reused."""
+        from app.services.career_service import get_career_plan
+        with patch.object(settings, 'OLLAMA_NUM_CTX', 4096), \
+                patch('ollama.AsyncClient.chat', new_callable=AsyncMock, return_value=mock_ollama_response) as mock_chat:
+            await get_career_plan(sample_job_request["category"], sample_job_request["job_description"], sample_job_request["timeline"])
+
+        kwargs = mock_chat.call_args.kwargs
+        assert kwargs["keep_alive"] == settings.OLLAMA_KEEP_ALIVE
+        assert kwargs["options"] == {"num_ctx": 4096}
+
+
+class TestModelWarmup:
+    """Test cases for the startup warm-up."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_ready_when_any_backend_is_warm(self):
+        """Test that one failing backend does not block readiness."""
+        pool = BackendPool(["http://a:11434", "http://b:11434"])
+        pool.backends[0].client.generate = AsyncMock(return_value={})
+        pool.backends[1].client.generate = AsyncMock(side_effect=ConnectionError("down"))
+        warmup = ModelWarmup()
+
+        assert await warmup.warm(pool) is True
+        assert warmup.ready
+        assert [backend.warm for backend in pool.backends] == [True, False]
+        pool.backends[0].client.generate.assert_awaited_once_with(model=settings.OLLAMA_MODEL, prompt="", **model_request_options())
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_not_ready_when_all_fail_or_time_out(self):
+        """Test that a hung model load is bounded by the warm-up timeout."""
+        async def hang(**kwargs):
+            await asyncio.sleep(10)
+
+        pool = BackendPool([None])
+        pool.backends[0].client.generate = hang
+        warmup = ModelWarmup()
+        with patch.object(settings, 'WARMUP_TIMEOUT_SECONDS', 0.05):
+            assert await warmup.warm(pool) is False
+        assert not warmup.ready
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_disabled_is_ready_immediately(self):
+        """Test that disabling warm-up marks the instance ready without calling the model."""
+        pool = BackendPool([None])
+        pool.backends[0].client.generate = AsyncMock()
+        warmup = ModelWarmup()
+        with patch.object(settings, 'WARMUP_ENABLED', False):
+            warmup.start(pool)
+        assert warmup.ready
+        pool.backends[0].client.generate.assert_not_called()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_retries_with_backoff_until_a_backend_is_warm(self):
+        """Test that a backend that comes up after startup is warmed by a later attempt."""
+        pool = BackendPool([None])
+        pool.backends[0].client.generate = AsyncMock(side_effect=[ConnectionError("down"), ConnectionError("down"), {}])
+        warmup = ModelWarmup()
+        with patch.object(settings, 'WARMUP_RETRY_INITIAL_SECONDS', 0.01), \
+                patch.object(settings, 'WARMUP_RETRY_MAX_SECONDS', 0.02):
+            warmup.start(pool)
+            for _ in range(100):
+                if warmup.ready:
+                    break
+                await asyncio.sleep(0.01)
+            await warmup.stop()
+        assert pool.backends[0].warm
+        assert pool.backends[0].client.generate.await_count == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_unloaded_model_is_reloaded_without_losing_readiness(self):
+        """Test that a model unloaded after keep_alive is warmed again in the background while staying ready."""
+        pool = BackendPool([None])
+        backend = pool.backends[0]
+        backend.client.generate = AsyncMock(return_value={})
+        backend.client.ps = AsyncMock(return_value={"models": []})
+        warmup = ModelWarmup()
+        with patch.object(settings, 'WARMUP_RETRY_INITIAL_SECONDS', 0.01):
+            warmup.start(pool)
+            await asyncio.wait_for(until(lambda: backend.warm), 1)
+
+            await pool.check_health(timeout=1)
+            assert not backend.warm
+            assert warmup.ready
+            await asyncio.wait_for(until(lambda: backend.warm), 1)
+            await warmup.stop()
+        assert backend.client.generate.await_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_keep_loaded_disabled_lets_model_unload(self):
+        """Test that WARMUP_KEEP_LOADED=False leaves an unloaded model alone after the first warm-up."""
+        pool = BackendPool([None])
+        backend = pool.backends[0]
+        backend.client.generate = AsyncMock(return_value={})
+        backend.client.ps = AsyncMock(return_value={"models": []})
+        warmup = ModelWarmup()
+        with patch.object(settings, 'WARMUP_RETRY_INITIAL_SECONDS', 0.01), \
+                patch.object(settings, 'WARMUP_KEEP_LOADED', False):
+            warmup.start(pool)
+            await asyncio.wait_for(until(lambda: backend.warm), 1)
+            await pool.check_health(timeout=1)
+            await asyncio.sleep(0.05)
+            await warmup.stop()
+        assert not backend.warm
+        assert backend.client.generate.await_count == 1
+
+
+class TestHealthEndpoints:
+    """Test cases for the liveness and readiness probes."""
+
+    @pytest.mark.integration
+    def test_ready_after_warmup(self, lifespan_settings):
+        """Test that /ready turns 200 once the startup warm-up has loaded the model."""
+        with patch('ollama.AsyncClient.generate', new_callable=AsyncMock, return_value={}) as mock_generate:
+            with TestClient(app) as client:
+                assert client.get("/health").json() == {"status": "ok"}
+                for _ in range(100):
+                    response = client.get("/ready")
+                    if response.status_code == 200:
+                        break
+                    time.sleep(0.01)
+                assert response.status_code == 200
+                assert response.json()["status"] == "ready"
+        mock_generate.assert_awaited()
+
+    @pytest.mark.integration
+    def test_not_ready_while_model_unavailable(self, lifespan_settings):
+        """Test that /ready reports 503 when the model could not be loaded, while /health stays 200."""
+        with patch('ollama.AsyncClient.generate', new_callable=AsyncMock, side_effect=ConnectionError("down")):
+            with TestClient(app) as client:
+                assert client.get("/health").status_code == 200
+                response = client.get("/ready")
+                assert response.status_code == 503
+                assert response.json()["status"] == "warming_up"